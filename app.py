@@ -2,26 +2,46 @@
 Slide Reports System - Main Flask Application
 """
 import os
-import json
+import sys
 import logging
+import functools
+import gzip
+import hashlib
+import hmac
+import time
+import traceback
 from datetime import datetime, timedelta
-from flask import Flask, render_template, request, jsonify, redirect, url_for, make_response
+from flask import Flask, Request, render_template, request, jsonify, redirect, url_for, make_response, g
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.routing import BaseConverter
 from dotenv import load_dotenv
+from markupsafe import escape
+import orjson
 
+from lib.cache import TTLCache
 from lib.encryption import Encryption
-from lib.database import Database, get_database_path
+from lib.json_provider import ORJSONProvider
+from lib.database import Database, get_database_path, get_cached_database, evict_cached_database, get_cached_data_source_counts
 from lib.slide_api import SlideAPIClient
 from lib.sync import SyncEngine
-from lib.templates import TemplateManager
+from lib.templates import get_cached_template_manager, evict_cached_template_manager
 from lib.ai_generator import AITemplateGenerator
 from lib.report_generator import ReportGenerator, format_datetime_friendly
+from lib.sandbox_config import get_compiled_template, template_uses_variable
 from lib.background_sync import background_sync
 from lib.scheduler import auto_sync_scheduler
-from lib.email_schedules import EmailScheduleManager
+from lib.email_schedules import EmailScheduleManager, DATE_RANGE_DAYS, report_window, DEFAULT_EMAIL_SUBJECT, DEFAULT_EMAIL_BODY
 from lib.email_service import EmailService
 from lib.email_scheduler import EmailScheduler
 from lib.pdf_service import PDFService
 from lib.email_builder import build_email_attachments, EmailTooLargeError
+from lib.template_validator import validate_template
+from lib.rate_limiter import check_rate_limit
+from lib.admin_utils import (
+    list_all_api_keys, get_system_stats, format_bytes, list_all_email_schedules,
+    toggle_auto_sync, delete_email_schedule, delete_key_data
+)
 import pytz
 import re
 
@@ -35,8 +55,44 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Request body limits by endpoint, enforced by Werkzeug while it reads the
+# body (including chunked uploads without a Content-Length)
+_ROUTE_MAX_CONTENT_LENGTH: dict[str, int] = {}
+
+
+class _RouteLimitedRequest(Request):
+    """Request that applies _ROUTE_MAX_CONTENT_LENGTH to the matched endpoint"""
+    
+    @property
+    def max_content_length(self) -> int | None:
+        limit = _ROUTE_MAX_CONTENT_LENGTH.get(self.endpoint)
+        if limit is not None:
+            return limit
+        return super().max_content_length
+
+
+class _AccountHashConverter(BaseConverter):
+    """
+    URL segment holding an account hash as produced by
+    Encryption.hash_api_key (and used in database filenames). Anything else
+    is a 404, so routes never build file paths from it.
+    """
+    regex = '[0-9a-f]{16}'
+
+
 # Initialize Flask app
 app = Flask(__name__)
+app.request_class = _RouteLimitedRequest
+app.url_map.converters['account_hash'] = _AccountHashConverter
+app.json = ORJSONProvider(app)
+
+# Reuse compiled page templates across worker restarts. Entries are keyed on
+# a checksum of the template source, so edits are picked up. The cache sits
+# with the account data rather than in a shared /tmp because Jinja loads
+# cached code with marshal.
+_jinja_cache_dir = os.path.join(os.environ.get('DATA_DIR', '/var/www/reports.slide.recipes/data'), 'jinja_cache')
+os.makedirs(_jinja_cache_dir, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(_jinja_cache_dir)
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
 
 # Initialize encryption
@@ -61,43 +117,187 @@ else:
     email_service = EmailService(postmark_api_key)
     email_scheduler = EmailScheduler(email_service, ai_generator)
 
+# Admin password; admin pages and APIs are disabled when unset
+admin_pass = os.environ.get('ADMIN_PASS')
+_admin_pass_bytes = None
+if admin_pass:
+    _admin_pass_bytes = admin_pass.encode('utf-8')
+
 
 # Helper Functions
+def _get_json_object() -> dict | None:
+    """
+    Parse the request body as a JSON object.
+    
+    Returns:
+        The parsed dict, or None if the body is missing, not valid JSON,
+        or not an object (callers answer 400 instead of failing on .get())
+    """
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        return data
+    return None
+
+
 def get_api_key_from_cookie() -> tuple[str | None, str | None]:
     """
     Get and decrypt API key from cookie.
     
+    The result is memoized on flask.g, so decorators and context processors
+    that ask again during the same request don't repeat the decryption.
+    
     Returns:
         Tuple of (api_key, api_key_hash) or (None, None) if not found
     """
-    encrypted_key = request.cookies.get('slide_api_key')
+    if 'api_key_cached' in g:
+        return g.api_key_cached
+    
+    g.api_key_cached = _decrypt_api_key_cookie(request.cookies.get('slide_api_key'))
+    return g.api_key_cached
+
+
+# Decrypted cookie values, keyed on the encrypted string. The encryption key
+# is fixed for the process lifetime, so an entry can only go stale by
+# eviction; the TTL just bounds how long plaintext keys stay in memory.
+_api_key_cookie_cache = TTLCache(maxsize=512, ttl=3600)
+
+
+def _decrypt_api_key_cookie(encrypted_key: str | None) -> tuple[str | None, str | None]:
+    """
+    Decrypt an API key cookie value into (api_key, api_key_hash).
+    
+    Successful results are cached across requests so polling routes don't
+    run AES + SHA-256 on every hit. Failures are not cached.
+    """
     if not encrypted_key:
         return None, None
     
+    cached = _api_key_cookie_cache.get(encrypted_key)
+    if cached is not None:
+        return cached
+    
     try:
         api_key = encryption.decrypt(encrypted_key)
         api_key_hash = Encryption.hash_api_key(api_key)
-        return api_key, api_key_hash
     except Exception as e:
         logger.error(f"Failed to decrypt API key: {e}")
         return None, None
+    
+    _api_key_cookie_cache.set(encrypted_key, (api_key, api_key_hash))
+    return api_key, api_key_hash
+
+
+@functools.lru_cache(maxsize=64)
+def _build_route_url(endpoint: str, script_root: str) -> str:
+    """url_for() result for an argument-free route under a given mount point"""
+    return url_for(endpoint)
+
+
+def _route_url(endpoint: str) -> str:
+    """
+    URL of a route that takes no arguments, e.g. a redirect target.
+    
+    Such URLs only vary with the script root the app is mounted under, so
+    they are built once per mount point instead of on every redirect.
+    """
+    return _build_route_url(endpoint, request.script_root)
 
 
 def require_api_key(f):
     """Decorator to require valid API key"""
-    from functools import wraps
-    
-    @wraps(f)
+    @functools.wraps(f)
     def decorated_function(*args, **kwargs):
         api_key, api_key_hash = get_api_key_from_cookie()
         if not api_key:
             if request.is_json:
                 return jsonify({'error': 'API key required'}), 401
-            return redirect(url_for('setup'))
+            return redirect(_route_url('setup'))
         return f(api_key, api_key_hash, *args, **kwargs)
     return decorated_function
 
 
+# Static (key, name) pairs for the data source pickers; only counts vary per request
+_DATA_SOURCE_SKELETON = tuple(SyncEngine.DATA_SOURCES.items())
+
+
+def _build_data_sources(counts: dict) -> list[dict]:
+    """
+    Build the data source list shown in pickers.
+    
+    Args:
+        counts: Record counts per data source
+    
+    Returns:
+        List of {'key', 'name', 'count'} dicts in DATA_SOURCES order
+    """
+    return [{'key': key, 'name': name, 'count': counts.get(key, 0)} for key, name in _DATA_SOURCE_SKELETON]
+
+
+# Python 3.11+ fromisoformat() accepts the trailing 'Z' our sync writer emits
+_PY311 = sys.version_info >= (3, 11)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_iso(timestamp: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp, accepting a trailing 'Z' for UTC.
+    
+    Memoized because the same sync/template timestamps are displayed on
+    every page load until they change.
+    """
+    if _PY311:
+        return datetime.fromisoformat(timestamp)
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+
+def _friendly_timestamp(timestamp: str, user_tz: pytz.BaseTzInfo, fallback: str) -> str:
+    """
+    Format a stored ISO timestamp for display in the user's timezone.
+    
+    Args:
+        timestamp: ISO 8601 string as stored in the database
+        user_tz: User's timezone
+        fallback: Text to show if the timestamp cannot be parsed
+    
+    Returns:
+        Human-friendly date string (see format_datetime_friendly)
+    """
+    try:
+        return format_datetime_friendly(_parse_iso(timestamp), user_tz)
+    except Exception:
+        return fallback
+
+
+# pytz timezone objects by name. Only names pytz accepted are stored, so the
+# cache is bounded by the size of the tz database.
+_TZ_CACHE: dict[str, pytz.BaseTzInfo] = {}
+
+
+def get_timezone(timezone_str: str) -> pytz.BaseTzInfo:
+    """
+    Get a pytz timezone object, reusing previously constructed ones.
+    
+    Args:
+        timezone_str: IANA timezone name
+    
+    Returns:
+        pytz timezone object
+    
+    Raises:
+        pytz.exceptions.UnknownTimeZoneError: If the name is not a valid timezone
+    """
+    tz = _TZ_CACHE.get(timezone_str)
+    if tz is None:
+        tz = pytz.timezone(timezone_str)
+        _TZ_CACHE[timezone_str] = tz
+    return tz
+
+
+# Validated timezone preference per database path. api_set_timezone evicts
+# its entry, so the TTL only bounds staleness from other writers.
+_timezone_pref_cache = TTLCache(maxsize=256, ttl=60)
+
+
 def get_validated_timezone(db: Database) -> str:
     """
     Get validated timezone from database preferences.
@@ -109,42 +309,125 @@ def get_validated_timezone(db: Database) -> str:
     Returns:
         Valid timezone string
     """
-    import pytz
+    cached = _timezone_pref_cache.get(db.db_path)
+    if cached is not None:
+        return cached
     
     timezone = db.get_preference('timezone', 'America/New_York')
     
     # Validate timezone
     try:
-        pytz.timezone(timezone)
-        return timezone
+        get_timezone(timezone)
     except pytz.exceptions.UnknownTimeZoneError:
         logger.warning(f'Invalid timezone "{timezone}" in database, falling back to America/New_York')
         # Update database with valid timezone
-        db.set_preference('timezone', 'America/New_York')
-        return 'America/New_York'
+        timezone = 'America/New_York'
+        db.set_preference('timezone', timezone)
+    
+    _timezone_pref_cache.set(db.db_path, timezone)
+    return timezone
+
+
+# Custom logo ETags per api_key_hash. Logos rarely change and the
+# upload/delete handlers evict their entry, so a short TTL is plenty.
+_custom_logo_cache = TTLCache(maxsize=256, ttl=60)
+_CACHE_MISS = object()
+
+
+def _custom_logo_url(etag: str) -> str:
+    """Versioned URL for a custom logo, so browsers can cache it indefinitely"""
+    return url_for('custom_logo', v=etag)
+
+
+def _load_custom_logo() -> str | None:
+    """Look up the current user's custom logo URL, if any"""
+    _, api_key_hash = get_api_key_from_cookie()
+    if not api_key_hash:
+        return None
+    
+    etag = _custom_logo_cache.get(api_key_hash, _CACHE_MISS)
+    if etag is _CACHE_MISS:
+        db = get_cached_database(api_key_hash)
+        etag = db.get_custom_logo_etag()
+        _custom_logo_cache.set(api_key_hash, etag)
+    
+    if not etag:
+        return None
+    return _custom_logo_url(etag)
+
+
+class _CustomLogoProxy:
+    """
+    Lazy stand-in for the custom logo URL in templates.
+    
+    The logo is only resolved (cookie decrypt + preference lookup) when a
+    template actually tests or renders custom_logo_url, and the result is
+    memoized on flask.g for the rest of the request.
+    """
+    
+    def _resolve(self) -> str | None:
+        if 'custom_logo_url' not in g:
+            g.custom_logo_url = _load_custom_logo()
+        return g.custom_logo_url
+    
+    def __bool__(self):
+        return bool(self._resolve())
+    
+    def __str__(self):
+        return self._resolve() or ''
+    
+    def __html__(self):
+        return str(escape(str(self)))
+
+
+_custom_logo_proxy = _CustomLogoProxy()
 
 
 # Context Processors
 @app.context_processor
 def inject_custom_logo():
     """Make custom logo available to all templates"""
-    api_key, api_key_hash = get_api_key_from_cookie()
-    if api_key_hash:
-        db = Database(get_database_path(api_key_hash))
-        custom_logo = db.get_preference('custom_logo_base64')
-        if custom_logo:
-            return {'custom_logo_url': custom_logo}
-    return {'custom_logo_url': None}
+    return {'custom_logo_url': _custom_logo_proxy}
 
 
 # Routes
 @app.route('/')
 def index():
     """Home page - redirect to dashboard or setup"""
-    api_key, _ = get_api_key_from_cookie()
-    if api_key:
-        return redirect(url_for('dashboard'))
-    return redirect(url_for('setup'))
+    # Presence is enough to pick a redirect; the dashboard's require_api_key
+    # decrypts and validates, bouncing stale cookies back to setup
+    if request.cookies.get('slide_api_key'):
+        return redirect(_route_url('dashboard'))
+    return redirect(_route_url('setup'))
+
+
+# Keys Slide accepted recently, by SHA-256 of the key. Only successes are
+# kept, so a rejected or revoked key is always re-checked.
+_accepted_api_key_cache = TTLCache(maxsize=1024, ttl=300)
+
+
+def _api_key_accepted(api_key: str) -> bool:
+    """
+    Check an API key against Slide, skipping the round trip for a key that
+    passed within the last few minutes (e.g. a resubmitted setup form).
+    
+    Raises:
+        Whatever SlideAPIClient.test_connection() raises on network errors
+    """
+    key_digest = hashlib.sha256(api_key.encode('utf-8')).digest()
+    if _accepted_api_key_cache.get(key_digest):
+        return True
+    
+    if not SlideAPIClient(api_key).test_connection():
+        return False
+    
+    _accepted_api_key_cache.set(key_digest, True)
+    return True
+
+
+# Rendered setup.html by script root (its static URLs depend on the mount
+# point), filled on first request
+_setup_pages = {}
 
 
 @app.route('/setup')
@@ -165,14 +448,13 @@ def setup():
             if Encryption.validate_api_key_format(api_key_param):
                 # Test API key
                 try:
-                    client = SlideAPIClient(api_key_param)
-                    if client.test_connection():
+                    if _api_key_accepted(api_key_param):
                         # Encrypt and set cookie
                         encrypted_key = encryption.encrypt(api_key_param)
                         api_key_hash = Encryption.hash_api_key(api_key_param)
                         
                         # Store in database
-                        db = Database(get_database_path(api_key_hash))
+                        db = get_cached_database(api_key_hash)
                         db.store_encrypted_api_key(api_key_hash, encrypted_key)
                         
                         # Belt-and-suspenders: clear any prior "disabled"
@@ -185,7 +467,7 @@ def setup():
                         db.delete_preference('api_key_disabled_alert_sent_at')
                         
                         # Set cookie and redirect
-                        response = redirect(url_for('dashboard'))
+                        response = redirect(_route_url('dashboard'))
                         response.set_cookie(
                             'slide_api_key',
                             encrypted_key,
@@ -204,7 +486,18 @@ def setup():
         else:
             logger.info(f"Auto-login blocked: User already has a valid session")
     
-    return render_template('setup.html')
+    # The setup page has no per-request variables, so render it once per
+    # mount point. In debug mode (template auto-reload) re-render so edits
+    # show up.
+    html = _setup_pages.get(request.script_root)
+    if html is None or app.jinja_env.auto_reload:
+        html = render_template('setup.html')
+        _setup_pages[request.script_root] = html
+    
+    response = make_response(html)
+    if not api_key_param:
+        response.headers['Cache-Control'] = 'private, max-age=60'
+    return response
 
 
 @app.route('/api/setup', methods=['POST'])
@@ -218,8 +511,7 @@ def api_setup():
     
     # Test API key
     try:
-        client = SlideAPIClient(api_key)
-        if not client.test_connection():
+        if not _api_key_accepted(api_key):
             return jsonify({'error': 'API key is invalid or unauthorized'}), 401
     except Exception as e:
         logger.error(f"API test failed: {e}")
@@ -230,7 +522,7 @@ def api_setup():
     
     # Store encrypted API key in database for auto-sync
     api_key_hash = Encryption.hash_api_key(api_key)
-    db = Database(get_database_path(api_key_hash))
+    db = get_cached_database(api_key_hash)
     db.store_encrypted_api_key(api_key_hash, encrypted_key)
     
     # Belt-and-suspenders: clear any prior "disabled" markers so the email
@@ -258,51 +550,33 @@ def api_setup():
 @require_api_key
 def dashboard(api_key, api_key_hash):
     """Main dashboard"""
-    from datetime import datetime
-    import pytz
-    from lib.report_generator import format_datetime_friendly
-    
-    db = Database(get_database_path(api_key_hash))
+    db = get_cached_database(api_key_hash)
     
     # Get sync status
-    sync_engine = SyncEngine(SlideAPIClient(api_key), db)
-    sync_status = sync_engine.get_sync_status()
+    sync_status = SyncEngine.get_sync_status_from_db(db)
     
     # Get background sync state
     bg_state = background_sync.get_sync_state(api_key_hash)
     
     # Get data counts
-    counts = db.get_data_source_counts()
+    counts = get_cached_data_source_counts(db)
     
     # Get validated timezone
     timezone = get_validated_timezone(db)
-    user_tz = pytz.timezone(timezone)
+    user_tz = get_timezone(timezone)
     
     # Add friendly date formatting to sync status
     for key, status in sync_status.items():
         if status.get('last_sync'):
-            try:
-                last_sync_dt = datetime.fromisoformat(status['last_sync'].replace('Z', '+00:00'))
-                status['last_sync_friendly'] = format_datetime_friendly(last_sync_dt, user_tz)
-            except Exception:
-                status['last_sync_friendly'] = 'Unknown'
+            status['last_sync_friendly'] = _friendly_timestamp(status['last_sync'], user_tz, 'Unknown')
         else:
             status['last_sync_friendly'] = 'Never'
     
-    # Get upcoming scheduled emails
+    # Get the next 5 upcoming scheduled emails
     upcoming_schedules = []
     if email_service:
         esm = EmailScheduleManager(db.db_path)
-        all_schedules = esm.list_schedules()
-        now_utc = datetime.utcnow().isoformat()
-        upcoming_schedules = [
-            s for s in all_schedules 
-            if s.get('enabled') == 1 and s.get('next_run_at') and s.get('next_run_at') > now_utc
-        ]
-        # Sort by next_run_at
-        upcoming_schedules.sort(key=lambda x: x.get('next_run_at', ''))
-        # Limit to next 5
-        upcoming_schedules = upcoming_schedules[:5]
+        upcoming_schedules = esm.list_upcoming(5)
     
     return render_template('dashboard.html',
                          sync_status=sync_status,
@@ -333,10 +607,12 @@ def api_sync(api_key, api_key_hash):
 def api_data_clear(api_key, api_key_hash):
     """Clear all synced data while preserving preferences and schedules"""
     try:
-        db_path = get_database_path(api_key_hash)
-        db = Database(db_path)
+        db = get_cached_database(api_key_hash)
         db.clear_sync_data()
         
+        # Drop the cached handle so the next request starts from a fresh one
+        evict_cached_database(api_key_hash)
+        
         # Also clear the background sync state to ensure it doesn't think a sync is in progress
         background_sync.clear_sync_state(api_key_hash)
         
@@ -351,17 +627,26 @@ def api_data_clear(api_key, api_key_hash):
 @require_api_key
 def api_sync_status(api_key, api_key_hash):
     """Get current sync status (real-time during sync)"""
-    # Get background sync state
-    bg_state = background_sync.get_sync_state(api_key_hash)
+    return jsonify(_sync_status_payload(api_key_hash, background_sync.get_sync_state(api_key_hash)))
+
+
+def _sync_status_payload(api_key_hash: str, bg_state: dict) -> dict:
+    """
+    Build the sync status response from the background sync state.
+    
+    Args:
+        api_key_hash: Hash of the API key
+        bg_state: State from background_sync.get_sync_state()
     
+    Returns:
+        Dict with per-source status, overall sync state and record counts
+    """
     # Get database sync status
-    db = Database(get_database_path(api_key_hash))
-    client = SlideAPIClient(api_key)
-    sync_engine = SyncEngine(client, db)
-    db_status = sync_engine.get_sync_status()
+    db = get_cached_database(api_key_hash)
+    db_status = SyncEngine.get_sync_status_from_db(db)
     
     # Get current counts
-    counts = db.get_data_source_counts()
+    counts = get_cached_data_source_counts(db)
     
     # If syncing, merge with real-time progress
     if bg_state.get('status') == 'syncing':
@@ -372,73 +657,134 @@ def api_sync_status(api_key, api_key_hash):
                 db_status[source]['total_items_fetching'] = progress_data.get('total', 0)
     
     # Add overall sync state
-    response = {
+    return {
         'sources': db_status,
         'sync_state': bg_state.get('status', 'idle'),
         'current_source': bg_state.get('current_source'),
         'counts': counts
     }
+
+
+# /api/sync/stream wakes on state writes made in this process and otherwise
+# checks the sync state file this often (seconds), sends a comment line after
+# this many quiet checks so proxies keep the connection open, and closes after
+# SYNC_STREAM_MAX_SECONDS. Each open stream holds a worker thread, so the cap
+# is short; main.js falls back to polling /api/sync/status if the sync is
+# still running when the stream ends.
+SYNC_STREAM_INTERVAL = 1.0
+SYNC_STREAM_KEEPALIVE_TICKS = 15
+SYNC_STREAM_MAX_SECONDS = 60
+_SYNC_STREAM_KEEPALIVE = b': keepalive\n\n'
+
+
+@app.route('/api/sync/stream')
+@require_api_key
+def api_sync_stream(api_key, api_key_hash):
+    """
+    Stream sync status as Server-Sent Events.
+    
+    The background sync rewrites its state file on every progress tick, so
+    the stream only stats that file when woken and rebuilds the status
+    (database reads + JSON) when it actually changed. A sync running in this
+    process wakes the stream directly; one in another worker process is
+    picked up by the per-interval check of the shared file. The stream ends
+    once the sync completes or fails, or after SYNC_STREAM_MAX_SECONDS.
+    """
+    state_file = background_sync.get_state_file(api_key_hash)
     
-    return jsonify(response)
+    def generate():
+        deadline = time.monotonic() + SYNC_STREAM_MAX_SECONDS
+        version = background_sync.state_version(api_key_hash)
+        last_mtime = -1
+        quiet_ticks = 0
+        while True:
+            try:
+                mtime = os.stat(state_file).st_mtime_ns
+            except OSError:
+                mtime = None
+            
+            if mtime != last_mtime:
+                last_mtime = mtime
+                quiet_ticks = 0
+                payload = _sync_status_payload(api_key_hash, background_sync.get_sync_state(api_key_hash))
+                yield b'data: ' + orjson.dumps(payload) + b'\n\n'
+                if payload['sync_state'] in ('completed', 'error'):
+                    return
+            else:
+                quiet_ticks += 1
+                if quiet_ticks >= SYNC_STREAM_KEEPALIVE_TICKS:
+                    quiet_ticks = 0
+                    yield _SYNC_STREAM_KEEPALIVE
+            
+            if time.monotonic() >= deadline:
+                return
+            version = background_sync.wait_for_state_change(api_key_hash, version, SYNC_STREAM_INTERVAL)
+    
+    # Every event is already bytes, so skip Werkzeug's per-item encoding
+    response = app.response_class(generate(), mimetype='text/event-stream', direct_passthrough=True)
+    response.headers['Cache-Control'] = 'no-store'
+    # Stop nginx-style proxies from buffering the events
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _conditional_json(payload):
+    """
+    JSON response tagged with a content hash, answered with 304 when the
+    client already holds the same body.
+    
+    Used for read-only lists that only change when a sync runs; the client
+    must revalidate, so a finished sync is never masked by a cached copy.
+    """
+    response = jsonify(payload)
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest())
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
 
 
 @app.route('/api/data/sources')
 @require_api_key
 def api_data_sources(api_key, api_key_hash):
     """Get available data sources with counts"""
-    db = Database(get_database_path(api_key_hash))
-    counts = db.get_data_source_counts()
-    
-    sources = []
-    for key, name in SyncEngine.DATA_SOURCES.items():
-        sources.append({
-            'key': key,
-            'name': name,
-            'count': counts.get(key, 0)
-        })
+    db = get_cached_database(api_key_hash)
+    counts = get_cached_data_source_counts(db)
     
-    return jsonify(sources)
+    sources = _build_data_sources(counts)
+    
+    return _conditional_json(sources)
 
 
 @app.route('/api/clients')
 @require_api_key
 def api_clients(api_key, api_key_hash):
     """Get list of clients"""
-    db = Database(get_database_path(api_key_hash))
+    db = get_cached_database(api_key_hash)
     clients = db.get_records('clients', order_by='name')
     
-    return jsonify(clients)
+    return _conditional_json(clients)
 
 
 @app.route('/templates')
 @require_api_key
 def templates_list(api_key, api_key_hash):
     """List all templates"""
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     templates = tm.list_templates()
     
     # Get user timezone and format dates
-    db = Database(get_database_path(api_key_hash))
-    timezone_str = db.get_preference('timezone', 'America/New_York')
-    user_tz = pytz.timezone(timezone_str)
+    db = get_cached_database(api_key_hash)
+    timezone_str = get_validated_timezone(db)
+    user_tz = get_timezone(timezone_str)
     
     # Format dates for display
     for template in templates:
         if template.get('created_at'):
-            try:
-                created_dt = datetime.fromisoformat(template['created_at'])
-                template['created_at_friendly'] = format_datetime_friendly(created_dt, user_tz)
-            except Exception:
-                template['created_at_friendly'] = template['created_at']
+            template['created_at_friendly'] = _friendly_timestamp(template['created_at'], user_tz, template['created_at'])
         else:
             template['created_at_friendly'] = 'Unknown'
         
         if template.get('updated_at'):
-            try:
-                updated_dt = datetime.fromisoformat(template['updated_at'])
-                template['updated_at_friendly'] = format_datetime_friendly(updated_dt, user_tz)
-            except Exception:
-                template['updated_at_friendly'] = template['updated_at']
+            template['updated_at_friendly'] = _friendly_timestamp(template['updated_at'], user_tz, template['updated_at'])
         else:
             template['updated_at_friendly'] = 'Unknown'
     
@@ -449,20 +795,14 @@ def templates_list(api_key, api_key_hash):
 @require_api_key
 def templates_new(api_key, api_key_hash):
     """Create new template page"""
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     default_template = tm.get_default_template()
     
     # Get data sources
-    db = Database(get_database_path(api_key_hash))
-    counts = db.get_data_source_counts()
-    
-    data_sources = []
-    for key, name in SyncEngine.DATA_SOURCES.items():
-        data_sources.append({
-            'key': key,
-            'name': name,
-            'count': counts.get(key, 0)
-        })
+    db = get_cached_database(api_key_hash)
+    counts = get_cached_data_source_counts(db)
+    
+    data_sources = _build_data_sources(counts)
     
     return render_template('template_editor.html',
                          template=None,
@@ -470,17 +810,11 @@ def templates_new(api_key, api_key_hash):
                          data_sources=data_sources)
 
 
-@app.route('/templates/<template_id>')
+@app.route('/templates/<int(signed=True):template_id>')
 @require_api_key
 def templates_view(api_key, api_key_hash, template_id):
     """View/edit template"""
-    # Convert to int (Flask's <int:> doesn't support negative numbers)
-    try:
-        template_id = int(template_id)
-    except ValueError:
-        return "Invalid template ID", 400
-    
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     template = tm.get_template(template_id)
     
     if not template:
@@ -491,16 +825,10 @@ def templates_view(api_key, api_key_hash, template_id):
         template['is_builtin'] = template_id < 0
     
     # Get data sources
-    db = Database(get_database_path(api_key_hash))
-    counts = db.get_data_source_counts()
-    
-    data_sources = []
-    for key, name in SyncEngine.DATA_SOURCES.items():
-        data_sources.append({
-            'key': key,
-            'name': name,
-            'count': counts.get(key, 0)
-        })
+    db = get_cached_database(api_key_hash)
+    counts = get_cached_data_source_counts(db)
+    
+    data_sources = _build_data_sources(counts)
     
     return render_template('template_editor.html',
                          template=template,
@@ -511,8 +839,6 @@ def templates_view(api_key, api_key_hash, template_id):
 @require_api_key
 def api_templates_create(api_key, api_key_hash):
     """Create new template"""
-    from lib.template_validator import validate_template
-    from lib.rate_limiter import check_rate_limit
     
     # Check rate limit
     is_allowed, rate_limit_msg = check_rate_limit(api_key_hash, "template_create")
@@ -544,7 +870,7 @@ def api_templates_create(api_key, api_key_hash):
     # Log template creation for audit trail
     logger.info(f"Template created by {api_key_hash[:8]}: name='{name}', size={len(html_content)} bytes")
     
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     template_id = tm.create_template(name, description, html_content)
     
     response_data = {'template_id': template_id, 'success': True}
@@ -554,24 +880,16 @@ def api_templates_create(api_key, api_key_hash):
     return jsonify(response_data), 201
 
 
-@app.route('/api/templates/<template_id>', methods=['PATCH'])
+@app.route('/api/templates/<int(signed=True):template_id>', methods=['PATCH'])
 @require_api_key
 def api_templates_update(api_key, api_key_hash, template_id):
     """Update template"""
-    from lib.template_validator import validate_template
-    from lib.rate_limiter import check_rate_limit
     
     # Check rate limit
     is_allowed, rate_limit_msg = check_rate_limit(api_key_hash, "template_update")
     if not is_allowed:
         return jsonify({'error': rate_limit_msg}), 429
     
-    # Convert to int (Flask's <int:> doesn't support negative numbers)
-    try:
-        template_id = int(template_id)
-    except ValueError:
-        return jsonify({'error': 'Invalid template ID'}), 400
-    
     # Prevent editing built-in templates
     if template_id < 0:
         return jsonify({'error': 'Cannot edit built-in templates'}), 400
@@ -598,7 +916,7 @@ def api_templates_update(api_key, api_key_hash, template_id):
         # Log template update for audit trail
         logger.info(f"Template updated by {api_key_hash[:8]}: template_id={template_id}, size={len(html_content)} bytes")
     
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     tm.update_template(
         template_id,
         name=data.get('name'),
@@ -613,37 +931,25 @@ def api_templates_update(api_key, api_key_hash, template_id):
     return jsonify(response_data)
 
 
-@app.route('/api/templates/<template_id>', methods=['DELETE'])
+@app.route('/api/templates/<int(signed=True):template_id>', methods=['DELETE'])
 @require_api_key
 def api_templates_delete(api_key, api_key_hash, template_id):
     """Delete template"""
-    # Convert to int (Flask's <int:> doesn't support negative numbers)
-    try:
-        template_id = int(template_id)
-    except ValueError:
-        return jsonify({'error': 'Invalid template ID'}), 400
-    
     # Prevent deleting built-in templates
     if template_id < 0:
         return jsonify({'error': 'Cannot delete built-in templates'}), 400
     
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     tm.delete_template(template_id)
     
     return '', 204
 
 
-@app.route('/api/templates/<template_id>/clone', methods=['POST'])
+@app.route('/api/templates/<int(signed=True):template_id>/clone', methods=['POST'])
 @require_api_key
 def api_templates_clone(api_key, api_key_hash, template_id):
     """Clone a template (built-in or user template)"""
-    # Convert to int (Flask's <int:> doesn't support negative numbers)
-    try:
-        template_id = int(template_id)
-    except ValueError:
-        return jsonify({'error': 'Invalid template ID'}), 400
-    
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     source_template = tm.get_template(template_id)
     
     if not source_template:
@@ -686,29 +992,18 @@ def api_templates_generate(api_key, api_key_hash):
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/templates/generate-stream', methods=['POST'])
-@require_api_key
-def api_templates_generate_stream(api_key, api_key_hash):
-    """Generate template with AI using streaming"""
-    data = request.get_json()
-    description = data.get('description')
-    data_sources = data.get('data_sources', [])
-    
-    if not description:
-        return jsonify({'error': 'Description required'}), 400
-    
-    def generate():
-        """Generator function for streaming response"""
-        try:
-            # Call Claude API with streaming enabled
-            data_sources_str = ", ".join(data_sources) if data_sources else "all data sources"
-            
-            rules_text = "\n".join([f"- {key}: {value}" for key, value in ai_generator.template_schema['important_rules'].items()])
-            
-            system_prompt = f"""You are an expert at creating professional, print-ready HTML report templates using Jinja2.
+# Server-sent event framing for streamed template chunks
+_SSE_CHUNK_PREFIX = b'data: {"chunk": '
+_SSE_CHUNK_SUFFIX = b', "done": false}\n\n'
+
+# The safety rules come from the generator's static schema, so the system
+# prompt for streamed generation is identical for every request.
+_STREAM_RULES_TEXT = "\n".join(f"- {key}: {value}" for key, value in ai_generator.template_schema['important_rules'].items())
+
+_STREAM_SYSTEM_PROMPT = f"""You are an expert at creating professional, print-ready HTML report templates using Jinja2.
 
 CRITICAL SAFETY RULES - FOLLOW THESE EXACTLY:
-{rules_text}
+{_STREAM_RULES_TEXT}
 
 Generate a complete, self-contained HTML document with embedded CSS that:
 1. Is optimized for printing to PDF
@@ -720,49 +1015,72 @@ Generate a complete, self-contained HTML document with embedded CSS that:
 
 Return ONLY the complete HTML document, no explanations."""
 
-            user_prompt = f"""Create an HTML report template based on this description:
+# Leading ```/```html and trailing ``` fences Claude sometimes wraps output in
+_MARKDOWN_FENCE_RE = re.compile(r'^```(?:html)?|```$')
+
+_STREAM_USER_PROMPT_TMPL = """Create an HTML report template based on this description:
 
 {description}
 
-The template will use these data sources: {data_sources_str}
+The template will use these data sources: {sources}
 
 Include SAFE Jinja2 syntax for dynamic content. Make it professional and print-ready."""
 
-            accumulated_text = ""
+
+@app.route('/api/templates/generate-stream', methods=['POST'])
+@require_api_key
+def api_templates_generate_stream(api_key, api_key_hash):
+    """Generate template with AI using streaming"""
+    data = request.get_json()
+    description = data.get('description')
+    data_sources = data.get('data_sources', [])
+    
+    if not description:
+        return jsonify({'error': 'Description required'}), 400
+    
+    def generate():
+        """Generator function for streaming response"""
+        try:
+            # Call Claude API with streaming enabled
+            data_sources_str = ", ".join(data_sources) if data_sources else "all data sources"
+            
+            user_prompt = _STREAM_USER_PROMPT_TMPL.format(description=description, sources=data_sources_str)
+
+            chunks: list[str] = []
             
             # Stream from Claude
             with ai_generator.client.messages.stream(
                 model=ai_generator.MODEL,
                 max_tokens=16000,
-                system=system_prompt,
+                system=_STREAM_SYSTEM_PROMPT,
                 messages=[{
                     "role": "user",
                     "content": user_prompt
                 }]
             ) as stream:
                 for text in stream.text_stream:
-                    accumulated_text += text
-                    # Send chunk to client
-                    yield f"data: {json.dumps({'chunk': text, 'done': False})}\n\n"
+                    chunks.append(text)
+                    # Send chunk to client. Only the text needs JSON escaping;
+                    # the surrounding event framing is constant.
+                    yield _SSE_CHUNK_PREFIX + orjson.dumps(text) + _SSE_CHUNK_SUFFIX
             
             # Clean up if Claude added markdown code blocks
-            html_content = accumulated_text.strip()
-            if html_content.startswith('```html'):
-                html_content = html_content[7:]
-            if html_content.startswith('```'):
-                html_content = html_content[3:]
-            if html_content.endswith('```'):
-                html_content = html_content[:-3]
-            html_content = html_content.strip()
+            html_content = _MARKDOWN_FENCE_RE.sub('', ''.join(chunks).strip()).strip()
             
             # Send final complete HTML
-            yield f"data: {json.dumps({'html': html_content, 'done': True})}\n\n"
+            yield b'data: ' + orjson.dumps({'html': html_content, 'done': True}) + b'\n\n'
             
+        except GeneratorExit:
+            # Client went away; leaving the with-block above has already
+            # closed the upstream stream so no further tokens are generated
+            logger.info(f"Template generation stream closed by client for {api_key_hash[:8]}")
+            raise
         except Exception as e:
             logger.error(f"Streaming template generation failed: {e}")
-            yield f"data: {json.dumps({'error': str(e), 'done': True})}\n\n"
+            yield b'data: ' + orjson.dumps({'error': str(e), 'done': True}) + b'\n\n'
     
-    return app.response_class(generate(), mimetype='text/event-stream')
+    # Every event is already bytes, so skip Werkzeug's per-item encoding
+    return app.response_class(generate(), mimetype='text/event-stream', direct_passthrough=True)
 
 
 @app.route('/api/templates/improve', methods=['POST'])
@@ -806,7 +1124,7 @@ def api_templates_test(api_key, api_key_hash):
     end_date = datetime.fromisoformat(end_date_str) if end_date_str else None
     
     # Generate report with error handling
-    db = Database(get_database_path(api_key_hash))
+    db = get_cached_database(api_key_hash)
     generator = ReportGenerator(db)
     
     try:
@@ -823,7 +1141,6 @@ def api_templates_test(api_key, api_key_hash):
     except Exception as e:
         logger.error(f"Template test failed: {e}")
         # Return detailed error for debugging
-        import traceback
         error_detail = traceback.format_exc()
         return jsonify({
             'success': False,
@@ -861,20 +1178,14 @@ def api_templates_fix_error(api_key, api_key_hash):
 @require_api_key
 def reports_builder(api_key, api_key_hash):
     """Report builder interface"""
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     templates = tm.list_templates()
     
-    db = Database(get_database_path(api_key_hash))
-    counts = db.get_data_source_counts()
+    db = get_cached_database(api_key_hash)
+    counts = get_cached_data_source_counts(db)
     timezone = get_validated_timezone(db)
     
-    data_sources = []
-    for key, name in SyncEngine.DATA_SOURCES.items():
-        data_sources.append({
-            'key': key,
-            'name': name,
-            'count': counts.get(key, 0)
-        })
+    data_sources = _build_data_sources(counts)
     
     # Get list of clients for filtering
     clients = db.get_records('clients', order_by='name')
@@ -886,6 +1197,26 @@ def reports_builder(api_key, api_key_hash):
                          timezone=timezone)
 
 
+# Rendered report previews. The key covers the template source, the window,
+# the filters, timezone, logo and latest sync, so edits or new data miss;
+# hits also skip the AI executive summary call.
+_report_preview_cache = TTLCache(maxsize=128, ttl=300)
+
+
+def _report_preview_response(html: str):
+    """
+    Send preview HTML as-is rather than JSON-escaped inside {'html': ...}.
+    
+    The report builder writes it into the preview frame; if the URL is
+    opened directly, the sandbox CSP keeps it from running as a page of
+    this origin.
+    """
+    response = app.response_class(html, mimetype='text/html')
+    response.headers['Content-Security-Policy'] = 'sandbox'
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    return response
+
+
 @app.route('/api/reports/preview', methods=['POST'])
 @require_api_key
 def api_reports_preview(api_key, api_key_hash):
@@ -897,19 +1228,43 @@ def api_reports_preview(api_key, api_key_hash):
     data_sources = data.get('data_sources', [])
     client_id = data.get('client_id')  # Optional client filter
     
-    # Parse dates
-    start_date = datetime.fromisoformat(start_date_str) if start_date_str else None
-    end_date = datetime.fromisoformat(end_date_str) if end_date_str else None
-    
     # Get template
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     template = tm.get_template(template_id)
     
     if not template:
         return jsonify({'error': 'Template not found'}), 404
     
+    db = get_cached_database(api_key_hash)
+    
+    # Reuse a preview of the same template, window and data. Without explicit
+    # dates the window tracks the clock, so those previews are not cached.
+    cache_key = None
+    if start_date_str and end_date_str:
+        cache_key = (
+            db.db_path,
+            hashlib.blake2b(template['html_content'].encode('utf-8'), digest_size=16).digest(),
+            start_date_str,
+            end_date_str,
+            tuple(data_sources),
+            client_id,
+            get_validated_timezone(db),
+            str(_custom_logo_proxy),
+            db.get_latest_sync_at(),
+        )
+        html = _report_preview_cache.get(cache_key)
+        if html is not None:
+            return _report_preview_response(html)
+    
+    # Parse dates only when the preview actually has to be rendered
+    start_date = None
+    if start_date_str:
+        start_date = _parse_iso(start_date_str)
+    end_date = None
+    if end_date_str:
+        end_date = _parse_iso(end_date_str)
+    
     # Generate report
-    db = Database(get_database_path(api_key_hash))
     generator = ReportGenerator(db)
     
     try:
@@ -922,7 +1277,9 @@ def api_reports_preview(api_key, api_key_hash):
             client_id=client_id,
             ai_generator=ai_generator
         )
-        return jsonify({'html': html})
+        if cache_key is not None:
+            _report_preview_cache.set(cache_key, html)
+        return _report_preview_response(html)
     except Exception as e:
         logger.error(f"Report generation failed: {e}")
         return jsonify({'error': str(e)}), 500
@@ -944,14 +1301,14 @@ def api_reports_download(api_key, api_key_hash):
     end_date = datetime.fromisoformat(end_date_str) if end_date_str else None
     
     # Get template
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     template = tm.get_template(template_id)
     
     if not template:
         return jsonify({'error': 'Template not found'}), 404
     
     # Generate report with base64 images
-    db = Database(get_database_path(api_key_hash))
+    db = get_cached_database(api_key_hash)
     generator = ReportGenerator(db)
     
     try:
@@ -998,14 +1355,14 @@ def api_reports_download_pdf(api_key, api_key_hash):
     end_date = datetime.fromisoformat(end_date_str) if end_date_str else None
     
     # Get template
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     template = tm.get_template(template_id)
     
     if not template:
         return jsonify({'error': 'Template not found'}), 404
     
     # Generate report with base64 images
-    db = Database(get_database_path(api_key_hash))
+    db = get_cached_database(api_key_hash)
     generator = ReportGenerator(db)
     
     try:
@@ -1021,7 +1378,7 @@ def api_reports_download_pdf(api_key, api_key_hash):
         )
         
         # Convert HTML to PDF using weasyprint
-        pdf_bytes = PDFService.html_to_pdf(html)
+        pdf_bytes = PDFService.html_to_pdf(html, api_key_hash)
         
         # Create filename with date
         if start_date and end_date:
@@ -1052,105 +1409,197 @@ def api_set_timezone(api_key, api_key_hash):
     
     # Validate timezone using pytz
     try:
-        pytz.timezone(timezone)
+        get_timezone(timezone)
     except pytz.exceptions.UnknownTimeZoneError:
         # Fall back to Eastern Standard Time if timezone is invalid
         timezone = 'America/New_York'
         logger.warning(f'Invalid timezone provided, falling back to {timezone}')
     
-    db = Database(get_database_path(api_key_hash))
+    db = get_cached_database(api_key_hash)
     db.set_preference('timezone', timezone)
+    _timezone_pref_cache.pop(db.db_path)
     
     return jsonify({'success': True, 'timezone': timezone})
 
 
+# Custom logo upload limits
+_LOGO_MAX_BYTES = 2 * 1024 * 1024
+_LOGO_MULTIPART_OVERHEAD = 64 * 1024
+_LOGO_MIME_TYPES = {
+    'png': 'image/png',
+    'jpeg': 'image/jpeg',
+    'gif': 'image/gif',
+    'svg': 'image/svg+xml',
+}
+
+# Content-Length includes multipart framing, hence the allowance
+_ROUTE_MAX_CONTENT_LENGTH['api_upload_logo'] = _LOGO_MAX_BYTES + _LOGO_MULTIPART_OVERHEAD
+
+
+def _sniff_logo_type(file_data: bytes):
+    """
+    Identify an uploaded logo from its leading magic bytes.
+    
+    Returns:
+        'png', 'jpeg', 'gif' or 'svg', or None for anything else
+    """
+    head = file_data[:16]
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'jpeg'
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    # SVG is text; allow an XML prolog or comments before the root element
+    if b'<svg' in file_data[:1024]:
+        return 'svg'
+    return None
+
+
 @app.route('/api/preferences/logo', methods=['POST'])
 @require_api_key
 def api_upload_logo(api_key, api_key_hash):
     """Upload and save custom logo"""
-    import base64
-    import imghdr
-    
-    if 'logo' not in request.files:
-        return jsonify({'error': 'No logo file provided'}), 400
+    # Werkzeug stops reading the body once it passes the route limit
+    # (_ROUTE_MAX_CONTENT_LENGTH), before the upload is spooled
+    try:
+        if 'logo' not in request.files:
+            return jsonify({'error': 'No logo file provided'}), 400
+    except RequestEntityTooLarge:
+        return jsonify({'error': 'File size exceeds 2MB limit'}), 413
     
     file = request.files['logo']
     
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
     
-    # Read file data
     file_data = file.read()
     
-    # Validate file size (2MB max)
-    if len(file_data) > 2 * 1024 * 1024:
-        return jsonify({'error': 'File size exceeds 2MB limit'}), 400
+    # Validate file size (2MB max); the body limit also allows for the
+    # multipart framing, so the file itself can still be slightly over
+    if len(file_data) > _LOGO_MAX_BYTES:
+        return jsonify({'error': 'File size exceeds 2MB limit'}), 413
     
     # Validate file type
-    file_type = imghdr.what(None, h=file_data)
-    allowed_types = ['png', 'jpeg', 'gif', 'svg']
-    
-    # Special handling for SVG (imghdr doesn't detect SVG)
-    if file_type is None:
-        if file_data.startswith(b'<svg') or b'<svg' in file_data[:1024]:
-            file_type = 'svg'
-    
-    if file_type not in allowed_types:
+    file_type = _sniff_logo_type(file_data)
+    if file_type not in _LOGO_MIME_TYPES:
         return jsonify({'error': 'Invalid file type. Allowed: PNG, JPG, GIF, SVG'}), 400
     
-    # Determine MIME type
-    mime_types = {
-        'png': 'image/png',
-        'jpeg': 'image/jpeg',
-        'gif': 'image/gif',
-        'svg': 'image/svg+xml'
-    }
-    mime_type = mime_types.get(file_type, 'image/png')
-    
-    # Convert to base64
-    base64_data = base64.b64encode(file_data).decode('utf-8')
-    data_uri = f'data:{mime_type};base64,{base64_data}'
+    mime_type = _LOGO_MIME_TYPES[file_type]
     
-    # Store in database
-    db = Database(get_database_path(api_key_hash))
-    db.set_preference('custom_logo_base64', data_uri)
+    # Store raw bytes; pages reference it by URL and reports inline it
+    db = get_cached_database(api_key_hash)
+    etag = db.set_custom_logo(file_data, mime_type)
+    _custom_logo_cache.pop(api_key_hash)
     
     logger.info(f"Custom logo uploaded for user {api_key_hash[:8]}")
     
-    return jsonify({'success': True, 'message': 'Logo uploaded successfully', 'logo_url': data_uri})
+    return jsonify({'success': True, 'message': 'Logo uploaded successfully', 'logo_url': _custom_logo_url(etag)})
 
 
 @app.route('/api/preferences/logo', methods=['DELETE'])
 @require_api_key
 def api_delete_logo(api_key, api_key_hash):
     """Reset to default logo"""
-    db = Database(get_database_path(api_key_hash))
+    db = get_cached_database(api_key_hash)
     
-    # Delete the custom logo preference
-    with db.get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM user_preferences WHERE key = ?", ('custom_logo_base64',))
+    db.delete_custom_logo()
+    _custom_logo_cache.pop(api_key_hash)
     
     logger.info(f"Custom logo deleted for user {api_key_hash[:8]}")
     
     return jsonify({'success': True, 'message': 'Logo reset to default'})
 
 
+@app.route('/logo')
+@require_api_key
+def custom_logo(api_key, api_key_hash):
+    """Serve the current user's custom logo"""
+    db = get_cached_database(api_key_hash)
+    logo = db.get_custom_logo()
+    if not logo:
+        return '', 404
+    
+    response = make_response(logo['data'])
+    response.mimetype = logo['mime_type']
+    response.set_etag(logo['etag'])
+    # URLs carry the ETag as ?v=, so a given URL never changes content
+    response.headers['Cache-Control'] = 'private, max-age=86400, immutable'
+    # Uploaded SVGs must not run script if opened directly
+    response.headers['Content-Security-Policy'] = "default-src 'none'; style-src 'unsafe-inline'; sandbox"
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    return response.make_conditional(request)
+
+
+# Digests of page template sources (plus base.html), filled on first use
+_PAGE_SOURCE_DIGESTS = {}
+
+
+def _page_source_digest(template_name: str) -> str:
+    """Hash the source of a page template and the layout it extends"""
+    # In debug mode (template auto-reload) rehash so edits show up
+    digest = _PAGE_SOURCE_DIGESTS.get(template_name)
+    if digest is None or app.jinja_env.auto_reload:
+        hasher = hashlib.sha256()
+        for name in (template_name, 'base.html'):
+            source, _, _ = app.jinja_env.loader.get_source(app.jinja_env, name)
+            hasher.update(source.encode('utf-8'))
+        digest = hasher.hexdigest()[:16]
+        _PAGE_SOURCE_DIGESTS[template_name] = digest
+    return digest
+
+
+# Rendered bodies for _render_cacheable_page(), keyed on (ETag, script root)
+_cacheable_page_html = TTLCache(maxsize=128, ttl=3600)
+
+
+def _render_cacheable_page(template_name: str, logo_url: str | None, **context):
+    """
+    Render a page whose output only depends on its template source and the
+    user's custom logo, answering revalidations with 304 before rendering.
+    
+    The page sits behind the API key cookie, so it is private and always
+    revalidated; the ETag changes when the templates or the logo do. Since
+    the ETag pins the output, rendered bodies are reused across users.
+    """
+    etag = hashlib.sha256(
+        f"{VERSION}:{_page_source_digest(template_name)}:{logo_url or ''}".encode('utf-8')
+    ).hexdigest()[:32]
+    
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        key = (etag, request.script_root)
+        html = _cacheable_page_html.get(key)
+        if html is None:
+            html = render_template(template_name, **context)
+            _cacheable_page_html.set(key, html)
+        response = make_response(html)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
 @app.route('/logo-settings')
 @require_api_key
 def logo_settings(api_key, api_key_hash):
     """Logo management page"""
-    db = Database(get_database_path(api_key_hash))
-    custom_logo = db.get_preference('custom_logo_base64')
+    db = get_cached_database(api_key_hash)
+    etag = db.get_custom_logo_etag()
+    custom_logo = None
+    if etag:
+        custom_logo = _custom_logo_url(etag)
     
-    return render_template('logo_settings.html', custom_logo=custom_logo)
+    # base.html shows the same logo; pin it to the one looked up here
+    g.custom_logo_url = custom_logo
+    return _render_cacheable_page('logo_settings.html', custom_logo, custom_logo=custom_logo)
 
 
 @app.route('/report-values')
 @require_api_key
 def report_values_docs(api_key, api_key_hash):
     """Documentation page for all available report template variables"""
-    return render_template('report_values.html')
+    return _render_cacheable_page('report_values.html', str(_custom_logo_proxy))
 
 
 @app.route('/email-reports')
@@ -1171,11 +1620,11 @@ def email_reports_create(api_key, api_key_hash):
         return render_template('error.html', error='Email functionality is not configured. Please set POSTMARK_API_KEY in environment.'), 503
     
     # Get templates for dropdown
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     templates = tm.list_templates()
     
     # Get clients for optional filtering
-    db = Database(get_database_path(api_key_hash))
+    db = get_cached_database(api_key_hash)
     clients = db.get_records('clients', order_by='name')
     timezone = get_validated_timezone(db)
     
@@ -1201,11 +1650,11 @@ def email_reports_edit(api_key, api_key_hash, schedule_id):
         return render_template('error.html', error='Schedule not found'), 404
     
     # Get templates for dropdown
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     templates = tm.list_templates()
     
     # Get clients for optional filtering
-    db = Database(db_path)
+    db = get_cached_database(api_key_hash)
     clients = db.get_records('clients', order_by='name')
     timezone = get_validated_timezone(db)
     
@@ -1216,6 +1665,9 @@ def email_reports_edit(api_key, api_key_hash, schedule_id):
                          schedule=schedule)
 
 
+_EMAIL_LOG_PAGE_SIZE = 100
+
+
 @app.route('/email-reports/log')
 @require_api_key
 def email_reports_log(api_key, api_key_hash):
@@ -1223,13 +1675,23 @@ def email_reports_log(api_key, api_key_hash):
     if not email_service:
         return render_template('error.html', error='Email functionality is not configured. Please set POSTMARK_API_KEY in environment.'), 503
     
-    db_path = get_database_path(api_key_hash)
-    db = Database(db_path)
+    db = get_cached_database(api_key_hash)
+    
+    # Keyset pagination: ?before=<sent_at>&before_id=<log_id> continues after
+    # the last row of the previous page, walking idx_email_send_log_sent
+    before = request.args.get('before')
+    before_id = request.args.get('before_id', type=int)
+    where = ''
+    params = []
+    if before and before_id is not None:
+        where = 'WHERE (l.sent_at, l.log_id) < (?, ?)'
+        params = [before, before_id]
+    params.append(_EMAIL_LOG_PAGE_SIZE)
     
     # Get email send log with schedule names
     with db.get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
+        cursor.execute(f"""
             SELECT 
                 l.log_id,
                 l.schedule_id,
@@ -1241,12 +1703,18 @@ def email_reports_log(api_key, api_key_hash):
                 s.name as schedule_name
             FROM email_send_log l
             LEFT JOIN email_schedules s ON l.schedule_id = s.schedule_id
-            ORDER BY l.sent_at DESC
-            LIMIT 100
-        """)
-        logs = [dict(row) for row in cursor.fetchall()]
+            {where}
+            ORDER BY l.sent_at DESC, l.log_id DESC
+            LIMIT ?
+        """, params)
+        logs = list(map(dict, cursor))
     
-    return render_template('email_log.html', logs=logs)
+    next_page_url = None
+    if len(logs) == _EMAIL_LOG_PAGE_SIZE:
+        next_page_url = url_for('email_reports_log', before=logs[-1]['sent_at'], before_id=logs[-1]['log_id'])
+    
+    return render_template('email_log.html', logs=logs, next_page_url=next_page_url,
+                           is_first_page=not where)
 
 
 @app.route('/api/email-schedules', methods=['GET'])
@@ -1260,24 +1728,33 @@ def api_email_schedules_list(api_key, api_key_hash):
     esm = EmailScheduleManager(db_path)
     schedules = esm.list_schedules()
     
-    # Enrich with template names
-    tm = TemplateManager(api_key_hash)
-    for schedule in schedules:
-        template = tm.get_template(schedule['template_id'])
-        schedule['template_name'] = template['name'] if template else 'Unknown Template'
+    # Enrich with template and client names, one lookup each
+    tm = get_cached_template_manager(api_key_hash)
+    template_names = tm.get_template_names(schedule['template_id'] for schedule in schedules)
+    
+    db = get_cached_database(api_key_hash)
+    client_names = db.get_client_names(
+        schedule['client_id'] for schedule in schedules if schedule.get('client_id')
+    )
     
-    # Enrich with client names if applicable
-    db = Database(db_path)
     for schedule in schedules:
+        schedule['template_name'] = template_names.get(schedule['template_id'], 'Unknown Template')
         if schedule.get('client_id'):
-            clients = db.get_records('clients', where='client_id = ?', params=(schedule['client_id'],))
-            schedule['client_name'] = clients[0]['name'] if clients else 'Unknown Client'
+            schedule['client_name'] = client_names.get(schedule['client_id'], 'Unknown Client')
         else:
             schedule['client_name'] = 'All Clients'
     
     return jsonify(schedules)
 
 
+# Input validation for schedule create/update
+_EMAIL_ADDRESS_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\Z')
+_SCHEDULE_TIME_RE = re.compile(r'^\d{2}:\d{2}\Z')
+_VALID_DATE_RANGES = frozenset(DATE_RANGE_DAYS)
+_VALID_ATTACHMENT_FORMATS = frozenset({'html', 'pdf', 'both'})
+_VALID_FREQUENCIES = frozenset({'daily', 'weekly', 'monthly'})
+
+
 @app.route('/api/email-schedules', methods=['POST'])
 @require_api_key
 def api_email_schedules_create(api_key, api_key_hash):
@@ -1303,27 +1780,24 @@ def api_email_schedules_create(api_key, api_key_hash):
         return jsonify({'error': 'Email address is required'}), 400
     
     # Validate email format
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_pattern, email_address):
+    if not _EMAIL_ADDRESS_RE.match(email_address):
         return jsonify({'error': 'Invalid email address format'}), 400
     
     if template_id is None:
         return jsonify({'error': 'Template is required'}), 400
     
     # Validate template exists
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     template = tm.get_template(int(template_id))
     if not template:
         return jsonify({'error': 'Template not found'}), 404
     
     # Validate date range type
-    valid_date_ranges = ['last_day', '7_days', '30_days', '90_days']
-    if date_range_type not in valid_date_ranges:
+    if date_range_type not in _VALID_DATE_RANGES:
         return jsonify({'error': 'Invalid date range type'}), 400
     
     # Validate attachment format
-    valid_formats = ['html', 'pdf', 'both']
-    if attachment_format not in valid_formats:
+    if attachment_format not in _VALID_ATTACHMENT_FORMATS:
         return jsonify({'error': 'Invalid attachment format'}), 400
     
     # Get scheduling parameters
@@ -1334,15 +1808,14 @@ def api_email_schedules_create(api_key, api_key_hash):
     
     # Validate scheduling parameters if frequency is set
     if schedule_frequency:
-        valid_frequencies = ['daily', 'weekly', 'monthly']
-        if schedule_frequency not in valid_frequencies:
+        if schedule_frequency not in _VALID_FREQUENCIES:
             return jsonify({'error': 'Invalid schedule frequency'}), 400
         
         if not schedule_time:
             return jsonify({'error': 'Schedule time is required when frequency is set'}), 400
         
         # Validate time format
-        if not re.match(r'^\d{2}:\d{2}$', schedule_time):
+        if not _SCHEDULE_TIME_RE.match(schedule_time):
             return jsonify({'error': 'Invalid time format. Use HH:MM'}), 400
         
         if schedule_frequency == 'weekly' and schedule_day_of_week is None:
@@ -1353,7 +1826,7 @@ def api_email_schedules_create(api_key, api_key_hash):
     
     # Get user's timezone
     db_path = get_database_path(api_key_hash)
-    db = Database(db_path)
+    db = get_cached_database(api_key_hash)
     timezone = get_validated_timezone(db)
     
     # Create schedule
@@ -1406,36 +1879,32 @@ def api_email_schedules_update(api_key, api_key_hash, schedule_id):
     # Validate email if provided
     if 'email_address' in data:
         email_address = data['email_address'].strip()
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email_address):
+        if not _EMAIL_ADDRESS_RE.match(email_address):
             return jsonify({'error': 'Invalid email address format'}), 400
         data['email_address'] = email_address
     
     # Validate template if provided
     if 'template_id' in data:
-        tm = TemplateManager(api_key_hash)
+        tm = get_cached_template_manager(api_key_hash)
         template = tm.get_template(int(data['template_id']))
         if not template:
             return jsonify({'error': 'Template not found'}), 404
     
     # Validate date range type if provided
     if 'date_range_type' in data:
-        valid_date_ranges = ['last_day', '7_days', '30_days', '90_days']
-        if data['date_range_type'] not in valid_date_ranges:
+        if data['date_range_type'] not in _VALID_DATE_RANGES:
             return jsonify({'error': 'Invalid date range type'}), 400
     
     # Validate attachment format if provided
     if 'attachment_format' in data:
-        valid_formats = ['html', 'pdf', 'both']
-        if data['attachment_format'] not in valid_formats:
+        if data['attachment_format'] not in _VALID_ATTACHMENT_FORMATS:
             return jsonify({'error': 'Invalid attachment format'}), 400
     
     # Validate scheduling parameters if frequency is provided
     if 'schedule_frequency' in data:
         schedule_frequency = data.get('schedule_frequency')
         if schedule_frequency:
-            valid_frequencies = ['daily', 'weekly', 'monthly']
-            if schedule_frequency not in valid_frequencies:
+            if schedule_frequency not in _VALID_FREQUENCIES:
                 return jsonify({'error': 'Invalid schedule frequency'}), 400
             
             # If updating frequency, need time too
@@ -1449,7 +1918,7 @@ def api_email_schedules_update(api_key, api_key_hash, schedule_id):
     
     # Get timezone for recalculation
     db_path = get_database_path(api_key_hash)
-    db = Database(db_path)
+    db = get_cached_database(api_key_hash)
     timezone = get_validated_timezone(db)
     
     # Add timezone to data for recalculation
@@ -1498,30 +1967,18 @@ def api_email_schedules_test(api_key, api_key_hash, schedule_id):
         return jsonify({'error': 'Schedule not found'}), 404
     
     # Calculate date range based on date_range_type
-    db = Database(db_path)
-    timezone_str = db.get_preference('timezone', 'America/New_York')
-    user_tz = pytz.timezone(timezone_str)
-    
-    # Get "yesterday" in user's timezone
-    now = datetime.now(user_tz)
-    yesterday = now - timedelta(days=1)
-    end_date = yesterday.replace(hour=23, minute=59, second=59, microsecond=999999)
-    
-    # Calculate start date based on range type
-    date_range_type = schedule['date_range_type']
-    if date_range_type == 'last_day':
-        start_date = yesterday.replace(hour=0, minute=0, second=0, microsecond=0)
-    elif date_range_type == '7_days':
-        start_date = (yesterday - timedelta(days=6)).replace(hour=0, minute=0, second=0, microsecond=0)
-    elif date_range_type == '30_days':
-        start_date = (yesterday - timedelta(days=29)).replace(hour=0, minute=0, second=0, microsecond=0)
-    elif date_range_type == '90_days':
-        start_date = (yesterday - timedelta(days=89)).replace(hour=0, minute=0, second=0, microsecond=0)
-    else:
+    db = get_cached_database(api_key_hash)
+    timezone_str = get_validated_timezone(db)
+    user_tz = get_timezone(timezone_str)
+    
+    # Report on whole days ending with "yesterday" in user's timezone
+    range_days = DATE_RANGE_DAYS.get(schedule['date_range_type'])
+    if range_days is None:
         return jsonify({'error': 'Invalid date range type'}), 400
+    start_date, end_date = report_window(range_days, user_tz)
     
     # Get template
-    tm = TemplateManager(api_key_hash)
+    tm = get_cached_template_manager(api_key_hash)
     template = tm.get_template(schedule['template_id'])
     
     if not template:
@@ -1536,6 +1993,8 @@ def api_email_schedules_test(api_key, api_key_hash, schedule_id):
     # Build context for email subject and body rendering. The actual report
     # HTML is rendered inside build_email_attachments below (with image
     # optimization and the 10 MB Postmark size guard).
+    email_subject_source = schedule['email_subject'] or DEFAULT_EMAIL_SUBJECT
+    email_body_source = schedule['email_body'] or DEFAULT_EMAIL_BODY
     try:
         generator = ReportGenerator(db)
         email_context = generator._build_context(
@@ -1543,15 +2002,18 @@ def api_email_schedules_test(api_key, api_key_hash, schedule_id):
             '/static/img/logo.png', schedule.get('client_id')
         )
         
-        # Add exec_summary to context if AI generator is available
-        if ai_generator:
-            try:
-                email_context['exec_summary'] = ai_generator.generate_executive_summary(email_context)
-            except Exception as e:
-                logger.warning(f"AI summary generation failed: {e}")
-                email_context['exec_summary'] = generator._generate_summary(email_context)
-        else:
-            email_context['exec_summary'] = email_context.get('executive_summary', generator._generate_summary(email_context))
+        # Add exec_summary to context (via AI if available), but only when the
+        # subject or body shows it; the report HTML generates its own
+        if (template_uses_variable(email_subject_source, 'exec_summary')
+                or template_uses_variable(email_body_source, 'exec_summary')):
+            if ai_generator:
+                try:
+                    email_context['exec_summary'] = ai_generator.generate_executive_summary(email_context)
+                except Exception as e:
+                    logger.warning(f"AI summary generation failed: {e}")
+                    email_context['exec_summary'] = generator._generate_summary(email_context)
+            else:
+                email_context['exec_summary'] = email_context.get('executive_summary', generator._generate_summary(email_context))
         
     except Exception as e:
         logger.error(f"Report generation failed: {e}")
@@ -1559,24 +2021,11 @@ def api_email_schedules_test(api_key, api_key_hash, schedule_id):
     
     # Render email subject and body with template variables
     try:
-        from lib.sandbox_config import get_sandbox
-        
-        # Use sandboxed environment to prevent SSTI attacks
-        sandbox = get_sandbox()
-        
-        email_subject_template = sandbox.from_string(schedule['email_subject'] or "Slide Backup Report - {{ date_range }}")
+        # Compiled in the sandboxed environment to prevent SSTI attacks
+        email_subject_template = get_compiled_template(email_subject_source)
         rendered_subject = email_subject_template.render(**email_context)
         
-        email_body_template = sandbox.from_string(schedule['email_body'] or """Your Slide Backup Report for {{ date_range }} is ready.
-
-Executive Summary:
-{{ exec_summary }}
-
-Key Metrics:
-- Total Backups: {{ total_backups }}
-- Success Rate: {{ success_rate }}%
-
-Report generated at {{ generated_at }} ({{ timezone }})""")
+        email_body_template = get_compiled_template(email_body_source)
         rendered_body = email_body_template.render(**email_context)
         
     except Exception as e:
@@ -1590,6 +2039,7 @@ Report generated at {{ generated_at }} ({{ timezone }})""")
     try:
         attachments = build_email_attachments(
             generator=generator,
+            api_key_hash=api_key_hash,
             template_html=template['html_content'],
             start_date=start_date,
             end_date=end_date,
@@ -1632,494 +2082,512 @@ Report generated at {{ generated_at }} ({{ timezone }})""")
         return jsonify({'error': f'Failed to send email: {str(e)}'}), 500
 
 
-@app.route('/api/template-schema.json')
-@require_api_key
-def api_template_schema(api_key, api_key_hash):
-    """Get JSON schema of all template variables for LLM consumption"""
-    schema = {
-        "system": "Jinja2",
-        "description": "Template variables for Slide backup reports. Use Jinja2 syntax: {{ variable }} for output, {% if condition %} for conditionals, {% for item in list %} for loops.",
-        "documentation_url": "https://jinja.palletsprojects.com/",
-        "variables": {
-            "logo_url": {
-                "type": "string",
-                "description": "URL or path to logo image",
-                "example": "/static/img/logo.png"
-            },
-            "report_title": {
-                "type": "string",
-                "description": "Title of the report",
-                "example": "Slide Backup Report"
-            },
-            "date_range": {
-                "type": "string",
-                "description": "Human-readable date range for the report period",
-                "example": "2025-01-01 - 2025-01-31"
-            },
-            "generated_at": {
-                "type": "string",
-                "description": "Timestamp when report was generated (in user timezone)",
-                "example": "2025-10-15 14:30:00 EST"
-            },
-            "timezone": {
-                "type": "string",
-                "description": "User's timezone",
-                "example": "America/New_York"
-            },
-            "client_id": {
-                "type": "string|null",
-                "description": "Client ID if filtering by client, null for all clients",
-                "example": "client_123"
-            },
-            "client_name": {
-                "type": "string",
-                "description": "Client name (only present when filtering by client)",
-                "example": "BiffCo"
-            },
-            "exec_summary": {
-                "type": "string",
-                "description": "AI-generated executive summary (auto-generated if placeholder is present)",
-                "example": "During this reporting period, 148 backups were executed..."
-            },
-            "total_backups": {
-                "type": "integer",
-                "description": "Total number of backups in reporting period",
-                "example": 148
-            },
-            "successful_backups": {
-                "type": "integer",
-                "description": "Number of successful backups",
-                "example": 141
-            },
-            "failed_backups": {
-                "type": "integer",
-                "description": "Number of failed backups",
-                "example": 7
-            },
-            "success_rate": {
-                "type": "float",
-                "description": "Success percentage (0-100)",
-                "example": 95.3
-            },
-            "agent_backup_status": {
-                "type": "array",
-                "description": "List of per-agent backup status",
-                "item_type": "object",
-                "properties": {
-                    "name": "Agent display name",
-                    "last_backup": "Formatted datetime",
-                    "status": "Status string (Succeeded/Failed/Running)",
-                    "status_class": "CSS class (success/danger/warning)",
-                    "duration": "Formatted duration string"
-                }
-            },
-            "active_snapshots": {
-                "type": "integer",
-                "description": "Number of active (not deleted) snapshots",
-                "example": 126
-            },
-            "deleted_snapshots": {
-                "type": "integer",
-                "description": "Number of deleted snapshots",
-                "example": 34
-            },
-            "local_snapshots": {
-                "type": "integer",
-                "description": "Number of snapshots in local storage",
-                "example": 50
-            },
-            "cloud_snapshots": {
-                "type": "integer",
-                "description": "Number of snapshots in cloud storage",
-                "example": 76
-            },
-            "latest_screenshot": {
-                "type": "object|null",
-                "description": "Latest verification screenshot",
-                "properties": {
-                    "url": "Image URL",
-                    "agent_name": "Agent name",
-                    "captured_at": "Formatted datetime"
-                }
-            },
-            "total_alerts": {
-                "type": "integer",
-                "description": "Total alerts in reporting period",
-                "example": 12
-            },
-            "unresolved_alerts": {
-                "type": "integer",
-                "description": "Number of unresolved alerts",
-                "example": 3
-            },
-            "resolved_alerts": {
-                "type": "integer",
-                "description": "Number of resolved alerts",
-                "example": 9
-            },
-            "device_storage": {
-                "type": "array",
-                "description": "List of devices with storage info",
-                "item_type": "object",
-                "properties": {
-                    "name": "Device name",
-                    "used": "Used storage (formatted)",
-                    "total": "Total storage (formatted)",
-                    "percent": "Usage percentage (0-100)"
-                }
-            },
-            "agent_snapshot_totals": {
-                "type": "array",
-                "description": "List of snapshot totals per agent showing local and cloud snapshot counts",
-                "item_type": "object",
-                "properties": {
-                    "agent_name": "Agent display name",
-                    "local_count": "Number of snapshots in local storage",
-                    "cloud_count": "Number of snapshots in cloud storage"
-                }
-            },
-            "agent_snapshot_audit": {
-                "type": "array",
-                "description": "Complete snapshot audit data grouped by agent with verification status and location details",
-                "item_type": "object",
-                "properties": {
-                    "agent_name": "Agent display name",
-                    "agent_id": "Agent ID",
-                    "snapshots": "Array of snapshot objects with: date_formatted (string), location_local (boolean), location_cloud (boolean), verify_boot_passed (boolean), verify_fs_passed (boolean), screenshot_url (string|None)"
-                }
-            },
-            "total_vms": {
-                "type": "integer",
-                "description": "Total number of virtual machines",
-                "example": 5
-            },
-            "running_vms": {
-                "type": "integer",
-                "description": "Number of running VMs",
-                "example": 4
-            },
-            "stopped_vms": {
-                "type": "integer",
-                "description": "Number of stopped VMs",
-                "example": 1
-            },
-            "agent_calendars": {
-                "type": "array",
-                "description": "Calendar grid data per agent showing daily backup/snapshot status",
-                "item_type": "object",
-                "properties": {
-                    "agent_name": "Agent name",
-                    "agent_id": "Agent ID",
-                    "calendar_grid": "Array of day objects (see below)"
-                }
-            },
-            "agent_screenshots": {
-                "type": "array",
-                "description": "Screenshot pairs (oldest and newest) per agent",
-                "item_type": "object",
-                "properties": {
-                    "agent_name": "Agent name",
-                    "agent_id": "Agent ID",
-                    "oldest_screenshot": "Screenshot object (url, date, snapshot_id)",
-                    "newest_screenshot": "Screenshot object (url, date, snapshot_id)"
-                }
-            },
-            "storage_growth": {
-                "type": "object",
-                "description": "Overall storage growth metrics",
-                "properties": {
-                    "start_bytes": "Storage at period start (bytes)",
-                    "end_bytes": "Storage at period end (bytes)",
-                    "growth_bytes": "Net change (bytes)",
-                    "growth_percent": "Percentage change",
-                    "start_formatted": "Formatted start storage",
-                    "end_formatted": "Formatted end storage",
-                    "growth_formatted": "Formatted growth",
-                    "is_growth": "Boolean (true if growing, false if shrinking)"
-                }
-            },
-            "device_storage_growth": {
-                "type": "array",
-                "description": "Per-device storage growth breakdown",
-                "item_type": "object",
-                "properties": {
-                    "device_name": "Device name",
-                    "start_bytes": "Start storage (bytes)",
-                    "end_bytes": "End storage (bytes)",
-                    "growth_bytes": "Net change",
-                    "growth_percent": "Percentage change",
-                    "start_formatted": "Formatted values",
-                    "end_formatted": "Formatted values",
-                    "growth_formatted": "Formatted values",
-                    "is_growth": "Boolean"
-                }
-            },
-            "devices": {
-                "type": "array",
-                "description": "Raw list of devices (database records) - filtered by client_id if specified",
-                "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
-                "item_type": "object",
-                "properties": {
-                    "device_id": "string - Unique device identifier",
-                    "display_name": "string|None - Human-readable device name",
-                    "hostname": "string|None - Device hostname",
-                    "last_seen_at": "string (ISO format)|None - Last contact time (STRING, not datetime!)",
-                    "booted_at": "string (ISO format)|None - Boot time (STRING)",
-                    "ip_addresses": "string|None - JSON string of IP addresses",
-                    "os": "string|None - Operating system",
-                    "os_version": "string|None - OS version",
-                    "arch": "string|None - Architecture (x86_64, arm64, etc.)",
-                    "client_id": "string|None - Associated client ID",
-                    "storage_used_bytes": "integer|None - Used storage in bytes",
-                    "storage_total_bytes": "integer|None - Total storage in bytes"
-                }
-            },
-            "agents": {
-                "type": "array",
-                "description": "Raw list of agents (database records) - filtered by client_id if specified",
-                "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
-                "item_type": "object",
-                "properties": {
-                    "agent_id": "string - Unique agent identifier",
-                    "device_id": "string|None - Associated device ID",
-                    "display_name": "string|None - Human-readable agent name",
-                    "hostname": "string|None - Agent hostname",
-                    "last_seen_at": "string (ISO format)|None - Last contact time (STRING)",
-                    "booted_at": "string (ISO format)|None - Boot time (STRING)",
-                    "ip_addresses": "string|None - JSON string of IP addresses",
-                    "os": "string|None - Operating system",
-                    "os_version": "string|None - OS version",
-                    "arch": "string|None - Architecture",
-                    "client_id": "string|None - Associated client ID"
-                }
-            },
-            "backups": {
-                "type": "array",
-                "description": "Raw list of backups in the reporting period - filtered by client_id if specified",
-                "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
-                "item_type": "object",
-                "properties": {
-                    "backup_id": "string - Unique backup identifier",
-                    "agent_id": "string - Associated agent ID",
-                    "started_at": "string (ISO format)|None - Backup start time (STRING, not datetime!)",
-                    "ended_at": "string (ISO format)|None - Backup end time (STRING)",
-                    "status": "string - Status: 'succeeded', 'failed', 'running'",
-                    "error_code": "integer|None - Error code if failed",
-                    "error_message": "string|None - Error message if failed",
-                    "snapshot_id": "string|None - Associated snapshot ID"
-                }
-            },
-            "snapshots": {
-                "type": "array",
-                "description": "Raw list of snapshots in the reporting period - filtered by client_id if specified",
-                "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
-                "item_type": "object",
-                "properties": {
-                    "snapshot_id": "string - Unique snapshot identifier",
-                    "agent_id": "string - Associated agent ID",
-                    "backup_started_at": "string (ISO format)|None - Backup start time (STRING)",
-                    "backup_ended_at": "string (ISO format)|None - Backup end time (STRING)",
-                    "locations": "string|None - JSON string of storage locations",
-                    "deleted": "string|None - Deletion status",
-                    "deletions": "string|None - JSON string of deletion records",
-                    "verify_boot_screenshot_url": "string|None - URL to boot verification screenshot",
-                    "exists_local": "boolean - Exists in local storage",
-                    "exists_cloud": "boolean - Exists in cloud storage",
-                    "exists_deleted": "boolean - Has been deleted",
-                    "exists_deleted_retention": "boolean - Deleted by retention policy",
-                    "exists_deleted_manual": "boolean - Manually deleted"
-                }
-            },
-            "alerts": {
-                "type": "array",
-                "description": "Raw list of alerts in the reporting period - filtered by client_id if specified",
-                "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
-                "item_type": "object",
-                "properties": {
-                    "alert_id": "string - Unique alert identifier",
-                    "alert_type": "string - Alert type/category",
-                    "alert_fields": "string|None - JSON string of alert fields",
-                    "created_at": "string (ISO format)|None - Alert creation time (STRING)",
-                    "resolved": "integer - 0 for unresolved, 1 for resolved (use as boolean)",
-                    "device_id": "string|None - Associated device ID",
-                    "agent_id": "string|None - Associated agent ID"
-                }
-            },
-            "virtual_machines": {
-                "type": "array",
-                "description": "Raw list of VMs (database records) - filtered by client_id if specified",
-                "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
-                "item_type": "object",
-                "properties": {
-                    "virt_id": "string - Unique VM identifier",
-                    "device_id": "string|None - Associated device ID",
-                    "agent_id": "string|None - Associated agent ID",
-                    "snapshot_id": "string|None - Associated snapshot ID",
-                    "state": "string - VM state: 'running', 'stopped', etc.",
-                    "created_at": "string (ISO format)|None - VM creation time (STRING)",
-                    "expires_at": "string (ISO format)|None - VM expiration time (STRING)",
-                    "cpu_count": "integer|None - Number of CPUs",
-                    "memory_in_mb": "integer|None - Memory in megabytes"
-                }
-            },
-            "file_restores": {
-                "type": "array",
-                "description": "Raw list of file restores (database records) - filtered by client_id if specified",
-                "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
-                "item_type": "object",
-                "properties": {
-                    "file_restore_id": "string - Unique file restore identifier",
-                    "device_id": "string|None - Associated device ID",
-                    "agent_id": "string|None - Associated agent ID",
-                    "snapshot_id": "string|None - Associated snapshot ID",
-                    "created_at": "string (ISO format)|None - Restore creation time (STRING)",
-                    "expires_at": "string (ISO format)|None - Restore expiration time (STRING)"
-                }
-            },
-            "clients": {
-                "type": "array",
-                "description": "Raw list of clients (database records) - only the filtered client if client_id specified",
-                "warning": "Fields may be None/null. Always check before using!",
-                "item_type": "object",
-                "properties": {
-                    "client_id": "string - Unique client identifier",
-                    "name": "string|None - Client name",
-                    "comments": "string|None - Client comments/notes"
-                }
-            },
-            "audits": {
-                "type": "array",
-                "description": "Raw list of audit log entries in the reporting period (max 100) - filtered by client_id if specified",
-                "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
-                "item_type": "object",
-                "properties": {
-                    "audit_id": "string - Unique audit entry identifier",
-                    "audit_time": "string (ISO format) - Audit timestamp (STRING)",
-                    "account_id": "string|None - Associated account ID",
-                    "client_id": "string|None - Associated client ID",
-                    "user_id": "string|None - Associated user ID",
-                    "action": "string - Action performed (create, delete, update, etc.)",
-                    "resource_type": "string|None - Type of resource affected",
-                    "resource_id": "string|None - ID of resource affected",
-                    "note": "string|None - Additional notes"
-                }
-            },
-            "agent_config_overview": {
-                "type": "object",
-                "description": "Comprehensive configuration overview with devices grouped with their agents, including outlier detection",
-                "properties": {
-                    "devices": "array - List of device objects, each containing device_info and agents array",
-                    "summary": "object - Summary statistics (total_devices, total_agents, slow_backup_count, old_backup_count, config_outlier_count)"
-                },
-                "device_structure": {
-                    "device_info": "object - Full device configuration (all device fields from database)",
-                    "agents": "array - List of agent objects with full config and backup info"
-                },
-                "agent_structure": {
-                    "agent_info": "object - Full agent configuration (all agent fields including encryption_algorithm, platform, vss_writer_configs, passphrases, etc.)",
-                    "last_successful_backup_date": "string - Formatted date of last successful backup (e.g. '9:24AM Oct 17th 2025 EDT')",
-                    "last_backup_duration_minutes": "integer|None - Duration of last backup in minutes",
-                    "last_backup_duration_seconds": "integer|None - Duration of last backup in seconds",
-                    "is_slow_backup": "boolean - True if last backup took >30 minutes",
-                    "is_old_backup": "boolean - True if last backup was >7 days ago",
-                    "config_outlier": "boolean - True if agent config differs from majority",
-                    "ip_addresses_formatted": "string - Formatted IP addresses as comma-separated string",
-                    "last_seen_formatted": "string - Formatted last seen date (e.g. '9:24AM Oct 17th 2025 EDT')",
-                    "last_screenshot_url": "string|None - URL to latest snapshot screenshot"
-                },
-                "example_usage": "{% for device_group in agent_config_overview.devices %}...{{ device_group.device_info.hostname }}...{% for agent in device_group.agents %}...{{ agent.agent_info.os }}...{% endfor %}{% endfor %}"
+# JSON schema of all template variables, served for LLM consumption. It is
+# static, so it is serialized (and hashed for the ETag) once at import.
+_TEMPLATE_SCHEMA = {
+    "system": "Jinja2",
+    "description": "Template variables for Slide backup reports. Use Jinja2 syntax: {{ variable }} for output, {% if condition %} for conditionals, {% for item in list %} for loops.",
+    "documentation_url": "https://jinja.palletsprojects.com/",
+    "variables": {
+        "logo_url": {
+            "type": "string",
+            "description": "URL or path to logo image",
+            "example": "/static/img/logo.png"
+        },
+        "report_title": {
+            "type": "string",
+            "description": "Title of the report",
+            "example": "Slide Backup Report"
+        },
+        "date_range": {
+            "type": "string",
+            "description": "Human-readable date range for the report period",
+            "example": "2025-01-01 - 2025-01-31"
+        },
+        "generated_at": {
+            "type": "string",
+            "description": "Timestamp when report was generated (in user timezone)",
+            "example": "2025-10-15 14:30:00 EST"
+        },
+        "timezone": {
+            "type": "string",
+            "description": "User's timezone",
+            "example": "America/New_York"
+        },
+        "client_id": {
+            "type": "string|null",
+            "description": "Client ID if filtering by client, null for all clients",
+            "example": "client_123"
+        },
+        "client_name": {
+            "type": "string",
+            "description": "Client name (only present when filtering by client)",
+            "example": "BiffCo"
+        },
+        "exec_summary": {
+            "type": "string",
+            "description": "AI-generated executive summary (auto-generated if placeholder is present)",
+            "example": "During this reporting period, 148 backups were executed..."
+        },
+        "total_backups": {
+            "type": "integer",
+            "description": "Total number of backups in reporting period",
+            "example": 148
+        },
+        "successful_backups": {
+            "type": "integer",
+            "description": "Number of successful backups",
+            "example": 141
+        },
+        "failed_backups": {
+            "type": "integer",
+            "description": "Number of failed backups",
+            "example": 7
+        },
+        "success_rate": {
+            "type": "float",
+            "description": "Success percentage (0-100)",
+            "example": 95.3
+        },
+        "agent_backup_status": {
+            "type": "array",
+            "description": "List of per-agent backup status",
+            "item_type": "object",
+            "properties": {
+                "name": "Agent display name",
+                "last_backup": "Formatted datetime",
+                "status": "Status string (Succeeded/Failed/Running)",
+                "status_class": "CSS class (success/danger/warning)",
+                "duration": "Formatted duration string"
             }
         },
-        "important_rules": {
-            "datetime_handling": "All datetime fields are ISO format STRINGS, not datetime objects. You CANNOT use .days, .seconds, .strftime() directly! Use string formatting or check if None first.",
-            "null_safety": "ALWAYS check if a value exists before using it. Use 'if variable' or 'variable or default' patterns.",
-            "safe_filters": "Use safe filters: |length (not len()), |default('N/A'), variable or 'N/A'",
-            "avoid_python_operations": "Do NOT use Python datetime operations like (datetime1 - datetime2).days - this will fail!",
-            "avoid_complex_lookups": "Avoid selectattr with 'equalto' - it may fail. Use simple loops instead.",
-            "safe_example": "{% if device.storage_used_bytes %}{{ (device.storage_used_bytes / 1024**3)|round(1) }} GB{% else %}N/A{% endif %}"
+        "active_snapshots": {
+            "type": "integer",
+            "description": "Number of active (not deleted) snapshots",
+            "example": 126
         },
-        "jinja2_filters": {
-            "description": "Available Jinja2 filters for template expressions",
-            "filters": {
-                "length": "Get length of list/string: {{ items|length }} or {{ name|length }}",
-                "default": "Provide default value if None/missing: {{ var|default('N/A') }}",
-                "round": "Round numbers: {{ 3.14159|round(2) }} outputs 3.14",
-                "upper": "Uppercase string: {{ name|upper }}",
-                "lower": "Lowercase string: {{ name|lower }}",
-                "title": "Title case: {{ name|title }}",
-                "capitalize": "Capitalize first letter: {{ word|capitalize }}",
-                "join": "Join list with separator: {{ items|join(', ') }}",
-                "replace": "Replace substring: {{ text|replace('old', 'new') }}",
-                "trim": "Remove whitespace: {{ text|trim }}",
-                "truncate": "Truncate to length: {{ text|truncate(50) }}",
-                "abs": "Absolute value: {{ number|abs }}",
-                "int": "Convert to integer: {{ value|int }}",
-                "float": "Convert to float: {{ value|float }}",
-                "string": "Convert to string: {{ value|string }}"
-            },
-            "slicing": "Use Python slicing syntax: items[:10] for first 10, items[5:] for all after 5, items[::2] for every other"
+        "deleted_snapshots": {
+            "type": "integer",
+            "description": "Number of deleted snapshots",
+            "example": 34
         },
-        "safe_operations": {
-            "description": "Safe operations available in Jinja2 templates",
-            "math": "Use +, -, *, /, //, %, ** in expressions: {{ (value / 1024)|round(2) }}",
-            "comparisons": "Use ==, !=, <, >, <=, >= in conditionals: {% if count > 10 %}",
-            "logic": "Use 'and', 'or', 'not' in conditionals: {% if a and b %}",
-            "membership": "'in' operator for lists/strings: {% if 'text' in string %} or {% if item in list %}",
-            "string_concat": "Use ~ operator to concatenate: {{ first_name ~ ' ' ~ last_name }}",
-            "ternary": "Inline if/else: {{ 'yes' if condition else 'no' }}",
-            "none_coalescing": "Use 'or' for default values: {{ variable or 'default' }}"
+        "local_snapshots": {
+            "type": "integer",
+            "description": "Number of snapshots in local storage",
+            "example": 50
         },
-        "flags": {
-            "show_backup_stats": "True if backups data source selected",
-            "show_snapshots": "True if snapshots data source selected",
-            "show_alerts": "True if alerts data source selected",
-            "show_storage": "True if devices/storage data source selected",
-            "show_audits": "True if audits data source selected",
-            "show_virtualization": "True if virtual_machines data source selected"
+        "cloud_snapshots": {
+            "type": "integer",
+            "description": "Number of snapshots in cloud storage",
+            "example": 76
         },
-        "examples": [
-            {
-                "description": "Getting device or agent name (with fallbacks)",
-                "code": "{{ device.display_name or device.hostname or device.device_id }}\n{{ agent.display_name or agent.hostname or agent.agent_id }}"
-            },
-            {
-                "description": "Loop through all devices with safe name access",
-                "code": "{% for device in devices %}\n  <h4>{{ device.display_name or device.hostname }}</h4>\n  <p>OS: {{ device.os or 'Unknown' }}</p>\n{% endfor %}"
-            },
-            {
-                "description": "Loop through all agents",
-                "code": "{% for agent in agents %}\n  <div>{{ agent.display_name or agent.hostname }}: {{ agent.os }}</div>\n{% endfor %}"
-            },
-            {
-                "description": "Find backups for a specific agent",
-                "code": "{% for agent in agents %}\n  <h3>{{ agent.display_name or agent.hostname }}</h3>\n  {% for backup in backups %}\n    {% if backup.agent_id == agent.agent_id %}\n      <p>{{ backup.started_at }}: {{ backup.status }}</p>\n    {% endif %}\n  {% endfor %}\n{% endfor %}"
-            },
-            {
-                "description": "Display backup statistics with preprocessed data",
-                "code": "{% if show_backup_stats %}\n  <h2>Backup Statistics</h2>\n  <p>Total: {{ total_backups }}, Success Rate: {{ success_rate }}%</p>\n{% endif %}"
+        "latest_screenshot": {
+            "type": "object|null",
+            "description": "Latest verification screenshot",
+            "properties": {
+                "url": "Image URL",
+                "agent_name": "Agent name",
+                "captured_at": "Formatted datetime"
+            }
+        },
+        "total_alerts": {
+            "type": "integer",
+            "description": "Total alerts in reporting period",
+            "example": 12
+        },
+        "unresolved_alerts": {
+            "type": "integer",
+            "description": "Number of unresolved alerts",
+            "example": 3
+        },
+        "resolved_alerts": {
+            "type": "integer",
+            "description": "Number of resolved alerts",
+            "example": 9
+        },
+        "device_storage": {
+            "type": "array",
+            "description": "List of devices with storage info",
+            "item_type": "object",
+            "properties": {
+                "name": "Device name",
+                "used": "Used storage (formatted)",
+                "total": "Total storage (formatted)",
+                "percent": "Usage percentage (0-100)"
+            }
+        },
+        "agent_snapshot_totals": {
+            "type": "array",
+            "description": "List of snapshot totals per agent showing local and cloud snapshot counts",
+            "item_type": "object",
+            "properties": {
+                "agent_name": "Agent display name",
+                "local_count": "Number of snapshots in local storage",
+                "cloud_count": "Number of snapshots in cloud storage"
+            }
+        },
+        "agent_snapshot_audit": {
+            "type": "array",
+            "description": "Complete snapshot audit data grouped by agent with verification status and location details",
+            "item_type": "object",
+            "properties": {
+                "agent_name": "Agent display name",
+                "agent_id": "Agent ID",
+                "snapshots": "Array of snapshot objects with: date_formatted (string), location_local (boolean), location_cloud (boolean), verify_boot_passed (boolean), verify_fs_passed (boolean), screenshot_url (string|None)"
+            }
+        },
+        "total_vms": {
+            "type": "integer",
+            "description": "Total number of virtual machines",
+            "example": 5
+        },
+        "running_vms": {
+            "type": "integer",
+            "description": "Number of running VMs",
+            "example": 4
+        },
+        "stopped_vms": {
+            "type": "integer",
+            "description": "Number of stopped VMs",
+            "example": 1
+        },
+        "agent_calendars": {
+            "type": "array",
+            "description": "Calendar grid data per agent showing daily backup/snapshot status",
+            "item_type": "object",
+            "properties": {
+                "agent_name": "Agent name",
+                "agent_id": "Agent ID",
+                "calendar_grid": "Array of day objects (see below)"
+            }
+        },
+        "agent_screenshots": {
+            "type": "array",
+            "description": "Screenshot pairs (oldest and newest) per agent",
+            "item_type": "object",
+            "properties": {
+                "agent_name": "Agent name",
+                "agent_id": "Agent ID",
+                "oldest_screenshot": "Screenshot object (url, date, snapshot_id)",
+                "newest_screenshot": "Screenshot object (url, date, snapshot_id)"
+            }
+        },
+        "storage_growth": {
+            "type": "object",
+            "description": "Overall storage growth metrics",
+            "properties": {
+                "start_bytes": "Storage at period start (bytes)",
+                "end_bytes": "Storage at period end (bytes)",
+                "growth_bytes": "Net change (bytes)",
+                "growth_percent": "Percentage change",
+                "start_formatted": "Formatted start storage",
+                "end_formatted": "Formatted end storage",
+                "growth_formatted": "Formatted growth",
+                "is_growth": "Boolean (true if growing, false if shrinking)"
+            }
+        },
+        "device_storage_growth": {
+            "type": "array",
+            "description": "Per-device storage growth breakdown",
+            "item_type": "object",
+            "properties": {
+                "device_name": "Device name",
+                "start_bytes": "Start storage (bytes)",
+                "end_bytes": "End storage (bytes)",
+                "growth_bytes": "Net change",
+                "growth_percent": "Percentage change",
+                "start_formatted": "Formatted values",
+                "end_formatted": "Formatted values",
+                "growth_formatted": "Formatted values",
+                "is_growth": "Boolean"
+            }
+        },
+        "devices": {
+            "type": "array",
+            "description": "Raw list of devices (database records) - filtered by client_id if specified",
+            "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
+            "item_type": "object",
+            "properties": {
+                "device_id": "string - Unique device identifier",
+                "display_name": "string|None - Human-readable device name",
+                "hostname": "string|None - Device hostname",
+                "last_seen_at": "string (ISO format)|None - Last contact time (STRING, not datetime!)",
+                "booted_at": "string (ISO format)|None - Boot time (STRING)",
+                "ip_addresses": "string|None - JSON string of IP addresses",
+                "os": "string|None - Operating system",
+                "os_version": "string|None - OS version",
+                "arch": "string|None - Architecture (x86_64, arm64, etc.)",
+                "client_id": "string|None - Associated client ID",
+                "storage_used_bytes": "integer|None - Used storage in bytes",
+                "storage_total_bytes": "integer|None - Total storage in bytes"
+            }
+        },
+        "agents": {
+            "type": "array",
+            "description": "Raw list of agents (database records) - filtered by client_id if specified",
+            "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
+            "item_type": "object",
+            "properties": {
+                "agent_id": "string - Unique agent identifier",
+                "device_id": "string|None - Associated device ID",
+                "display_name": "string|None - Human-readable agent name",
+                "hostname": "string|None - Agent hostname",
+                "last_seen_at": "string (ISO format)|None - Last contact time (STRING)",
+                "booted_at": "string (ISO format)|None - Boot time (STRING)",
+                "ip_addresses": "string|None - JSON string of IP addresses",
+                "os": "string|None - Operating system",
+                "os_version": "string|None - OS version",
+                "arch": "string|None - Architecture",
+                "client_id": "string|None - Associated client ID"
+            }
+        },
+        "backups": {
+            "type": "array",
+            "description": "Raw list of backups in the reporting period - filtered by client_id if specified",
+            "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
+            "item_type": "object",
+            "properties": {
+                "backup_id": "string - Unique backup identifier",
+                "agent_id": "string - Associated agent ID",
+                "started_at": "string (ISO format)|None - Backup start time (STRING, not datetime!)",
+                "ended_at": "string (ISO format)|None - Backup end time (STRING)",
+                "status": "string - Status: 'succeeded', 'failed', 'running'",
+                "error_code": "integer|None - Error code if failed",
+                "error_message": "string|None - Error message if failed",
+                "snapshot_id": "string|None - Associated snapshot ID"
+            }
+        },
+        "snapshots": {
+            "type": "array",
+            "description": "Raw list of snapshots in the reporting period - filtered by client_id if specified",
+            "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
+            "item_type": "object",
+            "properties": {
+                "snapshot_id": "string - Unique snapshot identifier",
+                "agent_id": "string - Associated agent ID",
+                "backup_started_at": "string (ISO format)|None - Backup start time (STRING)",
+                "backup_ended_at": "string (ISO format)|None - Backup end time (STRING)",
+                "locations": "string|None - JSON string of storage locations",
+                "deleted": "string|None - Deletion status",
+                "deletions": "string|None - JSON string of deletion records",
+                "verify_boot_screenshot_url": "string|None - URL to boot verification screenshot",
+                "exists_local": "boolean - Exists in local storage",
+                "exists_cloud": "boolean - Exists in cloud storage",
+                "exists_deleted": "boolean - Has been deleted",
+                "exists_deleted_retention": "boolean - Deleted by retention policy",
+                "exists_deleted_manual": "boolean - Manually deleted"
+            }
+        },
+        "alerts": {
+            "type": "array",
+            "description": "Raw list of alerts in the reporting period - filtered by client_id if specified",
+            "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
+            "item_type": "object",
+            "properties": {
+                "alert_id": "string - Unique alert identifier",
+                "alert_type": "string - Alert type/category",
+                "alert_fields": "string|None - JSON string of alert fields",
+                "created_at": "string (ISO format)|None - Alert creation time (STRING)",
+                "resolved": "integer - 0 for unresolved, 1 for resolved (use as boolean)",
+                "device_id": "string|None - Associated device ID",
+                "agent_id": "string|None - Associated agent ID"
+            }
+        },
+        "virtual_machines": {
+            "type": "array",
+            "description": "Raw list of VMs (database records) - filtered by client_id if specified",
+            "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
+            "item_type": "object",
+            "properties": {
+                "virt_id": "string - Unique VM identifier",
+                "device_id": "string|None - Associated device ID",
+                "agent_id": "string|None - Associated agent ID",
+                "snapshot_id": "string|None - Associated snapshot ID",
+                "state": "string - VM state: 'running', 'stopped', etc.",
+                "created_at": "string (ISO format)|None - VM creation time (STRING)",
+                "expires_at": "string (ISO format)|None - VM expiration time (STRING)",
+                "cpu_count": "integer|None - Number of CPUs",
+                "memory_in_mb": "integer|None - Memory in megabytes"
+            }
+        },
+        "file_restores": {
+            "type": "array",
+            "description": "Raw list of file restores (database records) - filtered by client_id if specified",
+            "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
+            "item_type": "object",
+            "properties": {
+                "file_restore_id": "string - Unique file restore identifier",
+                "device_id": "string|None - Associated device ID",
+                "agent_id": "string|None - Associated agent ID",
+                "snapshot_id": "string|None - Associated snapshot ID",
+                "created_at": "string (ISO format)|None - Restore creation time (STRING)",
+                "expires_at": "string (ISO format)|None - Restore expiration time (STRING)"
+            }
+        },
+        "clients": {
+            "type": "array",
+            "description": "Raw list of clients (database records) - only the filtered client if client_id specified",
+            "warning": "Fields may be None/null. Always check before using!",
+            "item_type": "object",
+            "properties": {
+                "client_id": "string - Unique client identifier",
+                "name": "string|None - Client name",
+                "comments": "string|None - Client comments/notes"
+            }
+        },
+        "audits": {
+            "type": "array",
+            "description": "Raw list of audit log entries in the reporting period (max 100) - filtered by client_id if specified",
+            "warning": "Fields may be None/null. Always check before using! Datetime fields are ISO strings.",
+            "item_type": "object",
+            "properties": {
+                "audit_id": "string - Unique audit entry identifier",
+                "audit_time": "string (ISO format) - Audit timestamp (STRING)",
+                "account_id": "string|None - Associated account ID",
+                "client_id": "string|None - Associated client ID",
+                "user_id": "string|None - Associated user ID",
+                "action": "string - Action performed (create, delete, update, etc.)",
+                "resource_type": "string|None - Type of resource affected",
+                "resource_id": "string|None - ID of resource affected",
+                "note": "string|None - Additional notes"
+            }
+        },
+        "agent_config_overview": {
+            "type": "object",
+            "description": "Comprehensive configuration overview with devices grouped with their agents, including outlier detection",
+            "properties": {
+                "devices": "array - List of device objects, each containing device_info and agents array",
+                "summary": "object - Summary statistics (total_devices, total_agents, slow_backup_count, old_backup_count, config_outlier_count)"
             },
-            {
-                "description": "Loop through agent backup status (preprocessed)",
-                "code": "{% for agent in agent_backup_status %}\n  <div>{{ agent.name }}: {{ agent.status }} ({{ agent.duration }})</div>\n{% endfor %}"
+            "device_structure": {
+                "device_info": "object - Full device configuration (all device fields from database)",
+                "agents": "array - List of agent objects with full config and backup info"
             },
-            {
-                "description": "Display device storage with null safety",
-                "code": "{% for device in devices %}\n  <h4>{{ device.display_name or device.hostname }}</h4>\n  {% if device.storage_used_bytes and device.storage_total_bytes %}\n    <p>{{ (device.storage_used_bytes / 1024**3)|round(1) }} GB / {{ (device.storage_total_bytes / 1024**3)|round(1) }} GB</p>\n  {% else %}\n    <p>Storage: N/A</p>\n  {% endif %}\n{% endfor %}"
+            "agent_structure": {
+                "agent_info": "object - Full agent configuration (all agent fields including encryption_algorithm, platform, vss_writer_configs, passphrases, etc.)",
+                "last_successful_backup_date": "string - Formatted date of last successful backup (e.g. '9:24AM Oct 17th 2025 EDT')",
+                "last_backup_duration_minutes": "integer|None - Duration of last backup in minutes",
+                "last_backup_duration_seconds": "integer|None - Duration of last backup in seconds",
+                "is_slow_backup": "boolean - True if last backup took >30 minutes",
+                "is_old_backup": "boolean - True if last backup was >7 days ago",
+                "config_outlier": "boolean - True if agent config differs from majority",
+                "ip_addresses_formatted": "string - Formatted IP addresses as comma-separated string",
+                "last_seen_formatted": "string - Formatted last seen date (e.g. '9:24AM Oct 17th 2025 EDT')",
+                "last_screenshot_url": "string|None - URL to latest snapshot screenshot"
             },
-            {
-                "description": "Count items with length filter",
-                "code": "<p>Devices: {{ devices|length }}</p>\n<p>Agents: {{ agents|length }}</p>\n<p>Backups: {{ backups|length }}</p>"
-            }
-        ]
-    }
-    
-    return jsonify(schema)
+            "example_usage": "{% for device_group in agent_config_overview.devices %}...{{ device_group.device_info.hostname }}...{% for agent in device_group.agents %}...{{ agent.agent_info.os }}...{% endfor %}{% endfor %}"
+        }
+    },
+    "important_rules": {
+        "datetime_handling": "All datetime fields are ISO format STRINGS, not datetime objects. You CANNOT use .days, .seconds, .strftime() directly! Use string formatting or check if None first.",
+        "null_safety": "ALWAYS check if a value exists before using it. Use 'if variable' or 'variable or default' patterns.",
+        "safe_filters": "Use safe filters: |length (not len()), |default('N/A'), variable or 'N/A'",
+        "avoid_python_operations": "Do NOT use Python datetime operations like (datetime1 - datetime2).days - this will fail!",
+        "avoid_complex_lookups": "Avoid selectattr with 'equalto' - it may fail. Use simple loops instead.",
+        "safe_example": "{% if device.storage_used_bytes %}{{ (device.storage_used_bytes / 1024**3)|round(1) }} GB{% else %}N/A{% endif %}"
+    },
+    "jinja2_filters": {
+        "description": "Available Jinja2 filters for template expressions",
+        "filters": {
+            "length": "Get length of list/string: {{ items|length }} or {{ name|length }}",
+            "default": "Provide default value if None/missing: {{ var|default('N/A') }}",
+            "round": "Round numbers: {{ 3.14159|round(2) }} outputs 3.14",
+            "upper": "Uppercase string: {{ name|upper }}",
+            "lower": "Lowercase string: {{ name|lower }}",
+            "title": "Title case: {{ name|title }}",
+            "capitalize": "Capitalize first letter: {{ word|capitalize }}",
+            "join": "Join list with separator: {{ items|join(', ') }}",
+            "replace": "Replace substring: {{ text|replace('old', 'new') }}",
+            "trim": "Remove whitespace: {{ text|trim }}",
+            "truncate": "Truncate to length: {{ text|truncate(50) }}",
+            "abs": "Absolute value: {{ number|abs }}",
+            "int": "Convert to integer: {{ value|int }}",
+            "float": "Convert to float: {{ value|float }}",
+            "string": "Convert to string: {{ value|string }}"
+        },
+        "slicing": "Use Python slicing syntax: items[:10] for first 10, items[5:] for all after 5, items[::2] for every other"
+    },
+    "safe_operations": {
+        "description": "Safe operations available in Jinja2 templates",
+        "math": "Use +, -, *, /, //, %, ** in expressions: {{ (value / 1024)|round(2) }}",
+        "comparisons": "Use ==, !=, <, >, <=, >= in conditionals: {% if count > 10 %}",
+        "logic": "Use 'and', 'or', 'not' in conditionals: {% if a and b %}",
+        "membership": "'in' operator for lists/strings: {% if 'text' in string %} or {% if item in list %}",
+        "string_concat": "Use ~ operator to concatenate: {{ first_name ~ ' ' ~ last_name }}",
+        "ternary": "Inline if/else: {{ 'yes' if condition else 'no' }}",
+        "none_coalescing": "Use 'or' for default values: {{ variable or 'default' }}"
+    },
+    "flags": {
+        "show_backup_stats": "True if backups data source selected",
+        "show_snapshots": "True if snapshots data source selected",
+        "show_alerts": "True if alerts data source selected",
+        "show_storage": "True if devices/storage data source selected",
+        "show_audits": "True if audits data source selected",
+        "show_virtualization": "True if virtual_machines data source selected"
+    },
+    "examples": [
+        {
+            "description": "Getting device or agent name (with fallbacks)",
+            "code": "{{ device.display_name or device.hostname or device.device_id }}\n{{ agent.display_name or agent.hostname or agent.agent_id }}"
+        },
+        {
+            "description": "Loop through all devices with safe name access",
+            "code": "{% for device in devices %}\n  <h4>{{ device.display_name or device.hostname }}</h4>\n  <p>OS: {{ device.os or 'Unknown' }}</p>\n{% endfor %}"
+        },
+        {
+            "description": "Loop through all agents",
+            "code": "{% for agent in agents %}\n  <div>{{ agent.display_name or agent.hostname }}: {{ agent.os }}</div>\n{% endfor %}"
+        },
+        {
+            "description": "Find backups for a specific agent",
+            "code": "{% for agent in agents %}\n  <h3>{{ agent.display_name or agent.hostname }}</h3>\n  {% for backup in backups %}\n    {% if backup.agent_id == agent.agent_id %}\n      <p>{{ backup.started_at }}: {{ backup.status }}</p>\n    {% endif %}\n  {% endfor %}\n{% endfor %}"
+        },
+        {
+            "description": "Display backup statistics with preprocessed data",
+            "code": "{% if show_backup_stats %}\n  <h2>Backup Statistics</h2>\n  <p>Total: {{ total_backups }}, Success Rate: {{ success_rate }}%</p>\n{% endif %}"
+        },
+        {
+            "description": "Loop through agent backup status (preprocessed)",
+            "code": "{% for agent in agent_backup_status %}\n  <div>{{ agent.name }}: {{ agent.status }} ({{ agent.duration }})</div>\n{% endfor %}"
+        },
+        {
+            "description": "Display device storage with null safety",
+            "code": "{% for device in devices %}\n  <h4>{{ device.display_name or device.hostname }}</h4>\n  {% if device.storage_used_bytes and device.storage_total_bytes %}\n    <p>{{ (device.storage_used_bytes / 1024**3)|round(1) }} GB / {{ (device.storage_total_bytes / 1024**3)|round(1) }} GB</p>\n  {% else %}\n    <p>Storage: N/A</p>\n  {% endif %}\n{% endfor %}"
+        },
+        {
+            "description": "Count items with length filter",
+            "code": "<p>Devices: {{ devices|length }}</p>\n<p>Agents: {{ agents|length }}</p>\n<p>Backups: {{ backups|length }}</p>"
+        }
+    ]
+}
+
+_TEMPLATE_SCHEMA_JSON = app.json.dumps(_TEMPLATE_SCHEMA).encode('utf-8') + b'\n'
+_TEMPLATE_SCHEMA_ETAG = hashlib.sha256(_TEMPLATE_SCHEMA_JSON).hexdigest()[:32]
+# The schema compresses well and never changes, so gzip it once as well
+_TEMPLATE_SCHEMA_GZIP = gzip.compress(_TEMPLATE_SCHEMA_JSON, compresslevel=9, mtime=0)
+
+
+@app.route('/api/template-schema.json')
+@require_api_key
+def api_template_schema(api_key, api_key_hash):
+    """Get JSON schema of all template variables for LLM consumption"""
+    if request.accept_encodings['gzip']:
+        response = app.response_class(_TEMPLATE_SCHEMA_GZIP, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(f"{_TEMPLATE_SCHEMA_ETAG}-gzip")
+    else:
+        response = app.response_class(_TEMPLATE_SCHEMA_JSON, mimetype='application/json')
+        response.set_etag(_TEMPLATE_SCHEMA_ETAG)
+    response.vary.add('Accept-Encoding')
+    # Only changes on deploy; after the hour, revalidation is a 304
+    response.headers['Cache-Control'] = 'private, max-age=3600'
+    return response.make_conditional(request)
 
 
 @app.route('/logout')
 def logout():
     """Clear API key cookie"""
-    response = redirect(url_for('setup'))
+    response = redirect(_route_url('setup'))
     response.set_cookie('slide_api_key', '', max_age=0)
     return response
 
@@ -2128,45 +2596,95 @@ def logout():
 @require_api_key
 def api_set_auto_sync(api_key, api_key_hash):
     """Toggle auto-sync preference and/or update frequency"""
-    data = request.get_json()
+    data = _get_json_object()
+    if data is None:
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
     enabled = data.get('enabled')
     frequency_hours = data.get('frequency_hours')
     
-    db = Database(get_database_path(api_key_hash))
+    db = get_cached_database(api_key_hash)
     
+    updates = {}
     if enabled is not None:
-        db.set_preference('auto_sync_enabled', 'true' if enabled else 'false')
+        updates['auto_sync_enabled'] = 'true' if enabled else 'false'
     
     if frequency_hours is not None:
-        db.set_preference('auto_sync_frequency_hours', str(frequency_hours))
+        updates['auto_sync_frequency_hours'] = str(frequency_hours)
+    
+    db.set_preferences(updates)
+    _auto_sync_pref_cache.pop(db.db_path)
+    
+    # Echo the effective settings; only read back what the caller left out
+    if enabled is None:
+        enabled = db.get_preference('auto_sync_enabled', 'false').lower() == 'true'
+    if frequency_hours is None:
+        frequency_hours = int(db.get_preference('auto_sync_frequency_hours', '1'))
     
     return jsonify({
         'success': True,
-        'enabled': enabled if enabled is not None else db.get_preference('auto_sync_enabled', 'false').lower() == 'true',
-        'frequency_hours': frequency_hours if frequency_hours is not None else int(db.get_preference('auto_sync_frequency_hours', '1'))
+        'enabled': enabled,
+        'frequency_hours': frequency_hours
     })
 
 
+# (enabled, frequency_hours) per database path. /api/sync/next is polled by
+# every open page; writes through this process evict the entry.
+_auto_sync_pref_cache = TTLCache(maxsize=256, ttl=60)
+
+
+def _get_auto_sync_prefs(db: Database) -> tuple[bool, int]:
+    """
+    Get the auto-sync preferences for an account, using a short-lived cache.
+    
+    Args:
+        db: Database instance
+    
+    Returns:
+        Tuple of (auto_sync_enabled, frequency_hours)
+    """
+    cached = _auto_sync_pref_cache.get(db.db_path)
+    if cached is not None:
+        return cached
+    
+    prefs = db.get_preferences(['auto_sync_enabled', 'auto_sync_frequency_hours'])
+    auto_sync = (
+        prefs.get('auto_sync_enabled', 'false').lower() == 'true',
+        int(prefs.get('auto_sync_frequency_hours', '1')),
+    )
+    _auto_sync_pref_cache.set(db.db_path, auto_sync)
+    return auto_sync
+
+
+@functools.lru_cache(maxsize=512)
+def _next_sync_timestamp(last_sync: str, frequency_hours: int) -> str:
+    """
+    Next auto-sync time after last_sync, as an ISO timestamp with a Z suffix.
+    
+    The sync-next endpoint is polled while these inputs rarely change, so
+    the parse/format round trip is memoized on the raw values.
+    """
+    # Parse timestamp with UTC indicator (Z suffix)
+    last_sync_dt = datetime.fromisoformat(last_sync.replace('Z', '+00:00'))
+    next_sync_dt = last_sync_dt + timedelta(hours=frequency_hours)
+    # Return with Z suffix to ensure JavaScript treats it as UTC
+    return next_sync_dt.isoformat().replace('+00:00', 'Z')
+
+
 @app.route('/api/sync/next')
 @require_api_key
 def api_sync_next(api_key, api_key_hash):
     """Get next scheduled sync time"""
-    db = Database(get_database_path(api_key_hash))
-    auto_sync_enabled = db.get_preference('auto_sync_enabled', 'false').lower() == 'true'
-    frequency_hours = int(db.get_preference('auto_sync_frequency_hours', '1'))
-    
-    # Get last sync time
-    bg_state = background_sync.get_sync_state(api_key_hash)
-    last_sync = bg_state.get('completed_at')
+    db = get_cached_database(api_key_hash)
+    auto_sync_enabled, frequency_hours = _get_auto_sync_prefs(db)
     
+    # The sync state file only matters for the next-sync estimate, so skip
+    # reading it while auto-sync is off
+    last_sync = None
     next_sync = None
-    if auto_sync_enabled and last_sync:
-        from datetime import datetime, timedelta
-        # Parse timestamp with UTC indicator (Z suffix)
-        last_sync_dt = datetime.fromisoformat(last_sync.replace('Z', '+00:00'))
-        next_sync_dt = last_sync_dt + timedelta(hours=frequency_hours)
-        # Return with Z suffix to ensure JavaScript treats it as UTC
-        next_sync = next_sync_dt.isoformat().replace('+00:00', 'Z')
+    if auto_sync_enabled:
+        last_sync = background_sync.get_sync_state(api_key_hash).get('completed_at')
+        if last_sync:
+            next_sync = _next_sync_timestamp(last_sync, frequency_hours)
     
     return jsonify({
         'auto_sync_enabled': auto_sync_enabled,
@@ -2176,46 +2694,71 @@ def api_sync_next(api_key, api_key_hash):
     })
 
 
+# Health check body never changes, so encode it once
+_HEALTH_JSON = app.json.dumps({'status': 'healthy', 'version': VERSION}).encode('utf-8') + b'\n'
+
+
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'version': VERSION})
+    response = app.response_class(_HEALTH_JSON, mimetype='application/json')
+    # Monitors must always reach the app, never a cached answer
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 
 # Admin Routes
+
+def _is_admin_secret(value: str | None) -> bool:
+    """Check a submitted admin password/token in constant time"""
+    if not _admin_pass_bytes or value is None:
+        return False
+    return hmac.compare_digest(value.encode('utf-8'), _admin_pass_bytes)
+
+
+def _admin_authorized() -> bool:
+    """Whether the request carries a valid admin_auth cookie"""
+    return _is_admin_secret(request.cookies.get('admin_auth'))
+
+
 def require_admin_auth(f):
     """Decorator to require admin authentication"""
+    @functools.wraps(f)
     def wrapper(*args, **kwargs):
-        admin_pass = os.environ.get('ADMIN_PASS')
         if not admin_pass:
             return jsonify({'error': 'Admin functionality not configured'}), 503
         
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or auth_header != f'Bearer {admin_pass}':
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme != 'Bearer' or not _is_admin_secret(token):
             return jsonify({'error': 'Unauthorized'}), 401
         
         return f(*args, **kwargs)
-    wrapper.__name__ = f.__name__
     return wrapper
 
 
+# Rendered admin login pages, keyed on (script root, nav logo URL)
+_admin_login_html = TTLCache(maxsize=64, ttl=3600)
+
+
 @app.route('/admin')
 def admin_page():
     """Admin dashboard page"""
-    admin_pass = os.environ.get('ADMIN_PASS')
     if not admin_pass:
-        return render_template('error.html', error='Admin functionality not configured'), 503
+        return _render_error_page('Admin functionality not configured'), 503
     
     # Check if authorized via session or show login
-    auth_token = request.cookies.get('admin_auth')
-    if auth_token != admin_pass:
-        # Show simple login page
-        return render_template('admin_login.html')
+    if not _admin_authorized():
+        # Show simple login page. Its only variable input is the nav logo.
+        key = (request.script_root, str(_custom_logo_proxy))
+        html = _admin_login_html.get(key)
+        if html is None or app.jinja_env.auto_reload:
+            html = render_template('admin_login.html')
+            _admin_login_html.set(key, html)
+        return html
     
-    from lib.admin_utils import list_all_api_keys, get_system_stats, format_bytes, list_all_email_schedules
     
     api_keys = list_all_api_keys()
-    stats = get_system_stats()
+    stats = get_system_stats(api_keys)
     email_schedules = list_all_email_schedules() if email_service else []
     
     return render_template('admin.html', 
@@ -2228,14 +2771,15 @@ def admin_page():
 @app.route('/admin/auth', methods=['POST'])
 def admin_auth():
     """Authenticate admin"""
-    admin_pass = os.environ.get('ADMIN_PASS')
     if not admin_pass:
         return jsonify({'error': 'Admin functionality not configured'}), 503
     
-    data = request.get_json()
+    data = _get_json_object()
+    if data is None:
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
     password = data.get('password')
     
-    if password == admin_pass:
+    if isinstance(password, str) and _is_admin_secret(password):
         response = jsonify({'success': True})
         response.set_cookie('admin_auth', admin_pass, max_age=86400)  # 24 hours
         return response
@@ -2243,38 +2787,31 @@ def admin_auth():
     return jsonify({'error': 'Invalid password'}), 401
 
 
-@app.route('/admin/api/keys/<api_key_hash>/auto-sync', methods=['POST'])
+@app.route('/admin/api/keys/<account_hash:api_key_hash>/auto-sync', methods=['POST'])
 def admin_toggle_auto_sync(api_key_hash):
     """Toggle auto-sync for a specific API key"""
-    admin_pass = os.environ.get('ADMIN_PASS')
-    auth_token = request.cookies.get('admin_auth')
-    
-    if not admin_pass or auth_token != admin_pass:
+    if not _admin_authorized():
         return jsonify({'error': 'Unauthorized'}), 401
     
-    from lib.admin_utils import toggle_auto_sync
-    
-    data = request.get_json()
+    data = _get_json_object()
+    if data is None:
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
     enabled = data.get('enabled', True)
     
     success = toggle_auto_sync(api_key_hash, enabled)
+    _auto_sync_pref_cache.pop(get_database_path(api_key_hash))
     
     if success:
         return jsonify({'success': True})
     return jsonify({'error': 'Failed to toggle auto-sync'}), 500
 
 
-@app.route('/admin/api/email-schedules/<api_key_hash>/<int:schedule_id>', methods=['DELETE'])
+@app.route('/admin/api/email-schedules/<account_hash:api_key_hash>/<int:schedule_id>', methods=['DELETE'])
 def admin_delete_email_schedule(api_key_hash, schedule_id):
     """Delete an email schedule as admin"""
-    admin_pass = os.environ.get('ADMIN_PASS')
-    auth_token = request.cookies.get('admin_auth')
-    
-    if not admin_pass or auth_token != admin_pass:
+    if not _admin_authorized():
         return jsonify({'error': 'Unauthorized'}), 401
     
-    from lib.admin_utils import delete_email_schedule
-    
     success = delete_email_schedule(api_key_hash, schedule_id)
     
     if success:
@@ -2282,18 +2819,15 @@ def admin_delete_email_schedule(api_key_hash, schedule_id):
     return jsonify({'error': 'Failed to delete schedule'}), 500
 
 
-@app.route('/admin/api/keys/<api_key_hash>', methods=['DELETE'])
+@app.route('/admin/api/keys/<account_hash:api_key_hash>', methods=['DELETE'])
 def admin_delete_key(api_key_hash):
     """Delete all data for a specific API key"""
-    admin_pass = os.environ.get('ADMIN_PASS')
-    auth_token = request.cookies.get('admin_auth')
-    
-    if not admin_pass or auth_token != admin_pass:
+    if not _admin_authorized():
         return jsonify({'error': 'Unauthorized'}), 401
     
-    from lib.admin_utils import delete_key_data
-    
     success = delete_key_data(api_key_hash)
+    evict_cached_database(api_key_hash)
+    evict_cached_template_manager(api_key_hash)
     
     if success:
         return jsonify({'success': True})
@@ -2301,18 +2835,44 @@ def admin_delete_key(api_key_hash):
 
 
 # Error Handlers
+_error_pages = {}
+
+
+def _render_error_page(message: str) -> str:
+    """
+    Render error.html for a fixed message, once per mount point.
+    
+    The page hides the nav and has no per-user content, so the HTML only
+    depends on the message and the script root its static URLs are built
+    against. Rendering it lazily (rather than at import) keeps url_for()
+    correct when the app is mounted under a prefix.
+    """
+    key = (request.script_root, message)
+    html = _error_pages.get(key)
+    if html is None:
+        html = render_template('error.html', error=message)
+        _error_pages[key] = html
+    return html
+
+
 @app.errorhandler(404)
 def not_found(e):
-    return render_template('error.html', error='Page not found'), 404
+    return _render_error_page('Page not found'), 404
 
 
 @app.errorhandler(500)
 def server_error(e):
     logger.error(f"Server error: {e}")
-    return render_template('error.html', error='Internal server error'), 500
+    return _render_error_page('Internal server error'), 500
 
 
 if __name__ == '__main__':
+    # The Werkzeug server is for development only; production goes through
+    # wsgi.py under gunicorn or mod_wsgi
+    if os.environ.get('FLASK_ENV', 'development') == 'production':
+        sys.exit("Refusing to start the development server with FLASK_ENV=production; "
+                 "run wsgi.py under gunicorn or mod_wsgi instead")
+    
     # Start auto-sync scheduler when running directly
     try:
         auto_sync_scheduler.start()
@@ -3,8 +3,9 @@ Admin utilities for managing API keys and system data.
 """
 import os
 import json
+import shutil
 from typing import List, Dict, Any, Optional
-from .database import Database, get_database_path, list_account_database_hashes
+from .database import get_cached_database, get_cached_data_source_counts, get_database_path, list_account_database_hashes
 
 
 def list_all_api_keys() -> List[Dict[str, Any]]:
@@ -62,10 +63,10 @@ def get_key_stats(api_key_hash: str) -> Dict[str, Any]:
     if not os.path.exists(db_path):
         return {'error': 'Database not found'}
     
-    db = Database(db_path)
+    db = get_cached_database(api_key_hash)
     
     # Get record counts
-    counts = db.get_data_source_counts()
+    counts = get_cached_data_source_counts(db)
     total_records = sum(counts.values())
     
     # Get sync status
@@ -77,8 +78,9 @@ def get_key_stats(api_key_hash: str) -> Dict[str, Any]:
                 last_sync = status['last_sync_at']
     
     # Get preferences
-    auto_sync_enabled = db.get_preference('auto_sync_enabled', 'false').lower() == 'true'
-    timezone = db.get_preference('timezone', 'America/New_York')
+    prefs = db.get_preferences(['auto_sync_enabled', 'timezone'])
+    auto_sync_enabled = prefs.get('auto_sync_enabled', 'false').lower() == 'true'
+    timezone = prefs.get('timezone', 'America/New_York')
     
     # Get database size
     db_size = get_file_size(db_path)
@@ -132,7 +134,7 @@ def toggle_auto_sync(api_key_hash: str, enabled: bool) -> bool:
         if not os.path.exists(db_path):
             return False
         
-        db = Database(db_path)
+        db = get_cached_database(api_key_hash)
         db.set_preference('auto_sync_enabled', 'true' if enabled else 'false')
         return True
     except Exception:
@@ -152,10 +154,12 @@ def delete_key_data(api_key_hash: str) -> bool:
     try:
         data_dir = os.environ.get('DATA_DIR', '/var/www/reports.slide.recipes/data')
         
-        # Delete main database
+        # Delete main database (plus its WAL sidecar files, which would
+        # otherwise be replayed into a freshly created database)
         db_path = os.path.join(data_dir, f"{api_key_hash}.db")
-        if os.path.exists(db_path):
-            os.remove(db_path)
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
         
         # Delete templates database
         templates_path = os.path.join(data_dir, f"{api_key_hash}_templates.db")
@@ -167,6 +171,9 @@ def delete_key_data(api_key_hash: str) -> bool:
         if os.path.exists(sync_state_path):
             os.remove(sync_state_path)
         
+        # Delete cached PDFs (rendered reports contain account data)
+        shutil.rmtree(os.path.join(data_dir, 'pdf_cache', api_key_hash), ignore_errors=True)
+        
         return True
     except Exception as e:
         import logging
@@ -174,9 +181,16 @@ def delete_key_data(api_key_hash: str) -> bool:
         return False
 
 
-def get_system_stats() -> Dict[str, Any]:
-    """Get overall system statistics"""
-    api_keys = list_all_api_keys()
+def get_system_stats(api_keys: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Get overall system statistics.
+    
+    Args:
+        api_keys: Result of list_all_api_keys(), if the caller already has it.
+            Listing opens every account database, so pass it to avoid a rescan.
+    """
+    if api_keys is None:
+        api_keys = list_all_api_keys()
     
     total_keys = len(api_keys)
     total_records = sum(key.get('total_records', 0) for key in api_keys)
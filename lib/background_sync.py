@@ -9,7 +9,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from .slide_api import SlideAPIClient, InvalidAPIKeyError
 from .sync import SyncEngine
-from .database import Database, get_database_path
+from .database import get_cached_database, get_database_path, evict_cached_data_source_counts
 
 
 class BackgroundSyncManager:
@@ -18,6 +18,10 @@ class BackgroundSyncManager:
     def __init__(self):
         self.base_dir = os.environ.get('DATA_DIR', '/var/www/reports.slide.recipes/data')
         os.makedirs(self.base_dir, exist_ok=True)
+        # Bumped on every state write in this process so status streams can
+        # wake immediately instead of polling the state file
+        self._state_changed = threading.Condition()
+        self._state_versions = {}
     
     def get_state_file(self, api_key_hash: str) -> str:
         """Get the state file path for a user"""
@@ -76,10 +80,14 @@ class BackgroundSyncManager:
         state_file = self.get_state_file(api_key_hash)
         
         try:
-            with open(state_file, 'w') as f:
+            # Write then rename so pollers never read a half-written file
+            tmp_file = f"{state_file}.tmp"
+            with open(tmp_file, 'w') as f:
                 json.dump(state, f)
+            os.replace(tmp_file, state_file)
         except Exception as e:
             print(f"Failed to update sync state: {e}")
+        self._notify_state_change(api_key_hash)
     
     def clear_sync_state(self, api_key_hash: str):
         """Clear sync state to reset to idle"""
@@ -90,6 +98,34 @@ class BackgroundSyncManager:
                 os.remove(state_file)
         except Exception as e:
             print(f"Failed to clear sync state: {e}")
+        self._notify_state_change(api_key_hash)
+    
+    def _notify_state_change(self, api_key_hash: str):
+        """Wake any wait_for_state_change callers for this user"""
+        with self._state_changed:
+            self._state_versions[api_key_hash] = self._state_versions.get(api_key_hash, 0) + 1
+            self._state_changed.notify_all()
+    
+    def state_version(self, api_key_hash: str) -> int:
+        """Current in-process state version, for wait_for_state_change"""
+        with self._state_changed:
+            return self._state_versions.get(api_key_hash, 0)
+    
+    def wait_for_state_change(self, api_key_hash: str, version: int, timeout: float) -> int:
+        """
+        Block until this process writes the user's sync state past `version`,
+        or until `timeout` seconds pass. Writes from other worker processes
+        do not wake this, so callers should still check the state file.
+        
+        Returns:
+            The state version after waiting
+        """
+        with self._state_changed:
+            self._state_changed.wait_for(
+                lambda: self._state_versions.get(api_key_hash, 0) != version,
+                timeout
+            )
+            return self._state_versions.get(api_key_hash, 0)
     
     def start_sync(self, api_key: str, api_key_hash: str, data_sources: Optional[list] = None):
         """Start a background sync operation"""
@@ -123,17 +159,22 @@ class BackgroundSyncManager:
         logger = logging.getLogger(__name__)
         
         try:
-            db = Database(get_database_path(api_key_hash))
+            db = get_cached_database(api_key_hash)
             client = SlideAPIClient(api_key)
             sync_engine = SyncEngine(client, db)
             
             # Calculate cutoff date (90 days ago)
             cutoff_date = datetime.utcnow() - timedelta(days=90)
             
+            # This thread is the only writer while the sync runs, so keep the
+            # state in memory and just persist it on each tick rather than
+            # re-reading and re-parsing the state file every page.
+            state = self.get_sync_state(api_key_hash)
+            state.setdefault('progress', {})
+            
             def progress_callback(source: str, current: int, total: int, status: str):
                 """Update progress state"""
                 try:
-                    state = self.get_sync_state(api_key_hash)
                     state['current_source'] = source
                     state['progress'][source] = {
                         'current': current,
@@ -198,9 +239,11 @@ class BackgroundSyncManager:
             # Persist the disabled flag so the email scheduler can stop
             # sending stale reports and trigger the one-time alert.
             try:
-                db = Database(get_database_path(api_key_hash))
-                db.set_preference('api_key_status', 'disabled')
-                db.set_preference('api_key_disabled_at', datetime.utcnow().isoformat())
+                db = get_cached_database(api_key_hash)
+                db.set_preferences({
+                    'api_key_status': 'disabled',
+                    'api_key_disabled_at': datetime.utcnow().isoformat(),
+                })
             except Exception as pref_error:
                 logger.error(f"Failed to persist api_key_status=disabled for {api_key_hash[:8]}: {pref_error}")
             
@@ -232,6 +275,10 @@ class BackgroundSyncManager:
                 })
             except Exception as state_error:
                 logger.error(f"Failed to update error state: {state_error}")
+        finally:
+            # Even a failed sync may have written rows, so never keep serving
+            # the pre-sync counts.
+            evict_cached_data_source_counts(get_database_path(api_key_hash))
 
 
 # Global instance
@@ -0,0 +1,70 @@
+"""
+Small in-process caches for values that are expensive to look up but
+tolerate being briefly stale (preferences, rendered fragments, etc.).
+"""
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """Thread-safe, size-bounded cache whose entries expire after a fixed TTL"""
+    
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0):
+        """
+        Initialize cache.
+        
+        Args:
+            maxsize: Maximum number of entries; least recently used are evicted first
+            ttl: Time-to-live for each entry in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value.
+        
+        Args:
+            key: Cache key
+            default: Returned when the key is missing or expired
+            
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key, returning its value (or default if not cached)"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            return entry[1]
+    
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
@@ -3,16 +3,55 @@ Database schema and management for Slide Reports.
 Each user gets their own isolated SQLite database.
 """
 import sqlite3
+import base64
+import hashlib
 import json
+import logging
 import os
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from contextlib import contextmanager
+from .cache import TTLCache
 
 
 ACCOUNT_DATABASE_FILENAME = re.compile(r'^(?P<api_key_hash>[0-9a-f]{16})\.db$')
 
+# Maximum number of per-account Database handles kept alive by
+# get_cached_database(). Least recently used handles are dropped first.
+DATABASE_CACHE_SIZE = 64
+
+# Seconds get_cached_data_source_counts() may serve counts without re-running
+# the per-table COUNT(*) queries.
+DATA_SOURCE_COUNTS_TTL = 10
+
+
+# Memory-map up to this many bytes of the database file for reads
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+
+def configure_connection(conn: sqlite3.Connection):
+    """
+    Apply per-connection PRAGMAs for account databases.
+    
+    journal_mode=WAL is persistent and set once in Database._initialize_schema;
+    these settings only last for the connection, so every new connection
+    needs them.
+    """
+    # WAL makes NORMAL durable enough while avoiding an fsync on every commit
+    conn.execute("PRAGMA synchronous=NORMAL")
+    # Keep sort/temp b-trees for report queries off disk
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # Read pages straight from the OS page cache instead of copying them in
+    conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+
+
+def _logo_etag(data: bytes) -> str:
+    """Content hash used to version custom logo URLs"""
+    return hashlib.sha256(data).hexdigest()[:16]
+
 
 class Database:
     """Manage SQLite database for a specific user"""
@@ -38,6 +77,7 @@ class Database:
         """Context manager for database connections"""
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
+        configure_connection(conn)
         try:
             yield conn
             conn.commit()
@@ -52,6 +92,10 @@ class Database:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
+            # WAL lets page reads run alongside background sync writes. The
+            # journal mode is persistent, so this only has to happen once.
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             # Schema metadata table for tracking database version and migrations
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS schema_metadata (
@@ -420,6 +464,17 @@ class Database:
                 )
             """)
             
+            # Custom report/navbar logo, stored as raw bytes (single row)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS custom_logo (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    mime_type TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    etag TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            
             # Create indexes for common queries
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_backups_agent ON backups(agent_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_backups_started ON backups(started_at)")
@@ -430,6 +485,7 @@ class Database:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_resolved ON alerts(resolved)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_audits_time ON audits(audit_time)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_agents_device ON agents(device_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_email_send_log_sent ON email_send_log(sent_at, log_id)")
             
             # Run migrations for existing databases
             self._migrate_snapshot_location_fields(cursor)
@@ -438,6 +494,10 @@ class Database:
             self._migrate_virtual_machines_vnc_enabled(cursor)
             self._migrate_devices_network_update_pending(cursor)
             self._migrate_agents_new_fields(cursor)
+            self._migrate_custom_logo_preference(cursor)
+            
+            # Indexes on migrated columns must come after the migrations
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_schedules_next_run ON email_schedules(enabled, next_run_at)")
             
             # Clear column cache after migrations in case new columns were added
             self._table_columns_cache.clear()
@@ -593,6 +653,27 @@ Report generated at {{ generated_at }} ({{ timezone }})"""
             if col_name not in existing_columns:
                 cursor.execute(f"ALTER TABLE agents ADD COLUMN {col_name} {col_type}")
     
+    def _migrate_custom_logo_preference(self, cursor):
+        """Move a legacy base64 data URI logo preference into custom_logo"""
+        cursor.execute("SELECT value FROM user_preferences WHERE key = 'custom_logo_base64'")
+        row = cursor.fetchone()
+        if not row:
+            return
+        
+        try:
+            header, encoded = row[0].split(',', 1)
+            mime_type = header[len('data:'):].split(';', 1)[0]
+            data = base64.b64decode(encoded)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Dropping unreadable custom logo preference: {e}")
+        else:
+            cursor.execute("""
+                INSERT OR REPLACE INTO custom_logo (id, mime_type, data, etag, updated_at)
+                VALUES (1, ?, ?, ?, ?)
+            """, (mime_type, data, _logo_etag(data), datetime.utcnow().isoformat()))
+        
+        cursor.execute("DELETE FROM user_preferences WHERE key = 'custom_logo_base64'")
+    
     def get_preference(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """Get a user preference value"""
         with self.get_connection() as conn:
@@ -601,6 +682,24 @@ Report generated at {{ generated_at }} ({{ timezone }})"""
             row = cursor.fetchone()
             return row['value'] if row else default
     
+    def get_preferences(self, keys: List[str]) -> Dict[str, str]:
+        """
+        Get several user preference values in one query.
+        
+        Returns:
+            Mapping of key to value for the keys that are set
+        """
+        if not keys:
+            return {}
+        placeholders = ', '.join(['?'] * len(keys))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT key, value FROM user_preferences WHERE key IN ({placeholders})",
+                list(keys)
+            )
+            return {row['key']: row['value'] for row in cursor.fetchall()}
+    
     def set_preference(self, key: str, value: str):
         """Set a user preference value"""
         with self.get_connection() as conn:
@@ -610,6 +709,18 @@ Report generated at {{ generated_at }} ({{ timezone }})"""
                 VALUES (?, ?, ?)
             """, (key, value, datetime.utcnow().isoformat()))
     
+    def set_preferences(self, preferences: Dict[str, str]):
+        """Set several user preference values in one transaction"""
+        if not preferences:
+            return
+        now = datetime.utcnow().isoformat()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR REPLACE INTO user_preferences (key, value, updated_at)
+                VALUES (?, ?, ?)
+            """, [(key, value, now) for key, value in preferences.items()])
+    
     def delete_preference(self, key: str):
         """Delete a user preference row. No-op if it does not exist."""
         with self.get_connection() as conn:
@@ -636,6 +747,56 @@ Report generated at {{ generated_at }} ({{ timezone }})"""
             """, (key, value, now))
             return cursor.rowcount == 1
     
+    def set_custom_logo(self, data: bytes, mime_type: str) -> str:
+        """
+        Store (or replace) the custom logo.
+        
+        Args:
+            data: Raw image bytes
+            mime_type: Image MIME type
+            
+        Returns:
+            ETag identifying this logo version
+        """
+        etag = _logo_etag(data)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO custom_logo (id, mime_type, data, etag, updated_at)
+                VALUES (1, ?, ?, ?, ?)
+            """, (mime_type, data, etag, datetime.utcnow().isoformat()))
+        return etag
+    
+    def get_custom_logo(self) -> Optional[Dict[str, Any]]:
+        """Get the custom logo as {'mime_type', 'data', 'etag'}, or None"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT mime_type, data, etag FROM custom_logo WHERE id = 1")
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
+    def get_custom_logo_etag(self) -> Optional[str]:
+        """Get the current custom logo's ETag without loading its bytes"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT etag FROM custom_logo WHERE id = 1")
+            row = cursor.fetchone()
+            return row['etag'] if row else None
+    
+    def get_custom_logo_data_uri(self) -> Optional[str]:
+        """Get the custom logo as a base64 data URI for standalone reports"""
+        logo = self.get_custom_logo()
+        if not logo:
+            return None
+        encoded = base64.b64encode(logo['data']).decode('ascii')
+        return f"data:{logo['mime_type']};base64,{encoded}"
+    
+    def delete_custom_logo(self):
+        """Remove the custom logo. No-op if none is set."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM custom_logo WHERE id = 1")
+    
     def update_sync_status(self, resource_type: str, status: str, 
                           items_synced: int = 0, error_message: Optional[str] = None):
         """Update sync status for a resource type"""
@@ -657,6 +818,13 @@ Report generated at {{ generated_at }} ({{ timezone }})"""
                 cursor.execute("SELECT * FROM sync_status ORDER BY resource_type")
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_latest_sync_at(self) -> Optional[str]:
+        """Most recent last_sync_at across all resource types, or None"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(last_sync_at) FROM sync_status")
+            return cursor.fetchone()[0]
+    
     def _get_table_columns(self, table: str) -> set:
         """
         Get valid column names for a table. Results are cached for performance.
@@ -731,6 +899,29 @@ Report generated at {{ generated_at }} ({{ timezone }})"""
             cursor.execute(query, params or ())
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_client_names(self, client_ids) -> Dict[str, str]:
+        """
+        Look up client names for several client IDs in one query.
+        
+        Args:
+            client_ids: Iterable of client IDs
+            
+        Returns:
+            Mapping of client_id to name for the IDs that exist
+        """
+        client_ids = list(set(client_ids))
+        if not client_ids:
+            return {}
+        
+        placeholders = ', '.join(['?'] * len(client_ids))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT client_id, name FROM clients WHERE client_id IN ({placeholders})",
+                client_ids
+            )
+            return {row['client_id']: row['name'] for row in cursor.fetchall()}
+    
     def clear_sync_data(self):
         """
         Clear all synced data from the database while preserving preferences, 
@@ -758,6 +949,8 @@ Report generated at {{ generated_at }} ({{ timezone }})"""
                     error_message = NULL, 
                     items_synced = 0
             """)
+        
+        evict_cached_data_source_counts(self.db_path)
     
     def prune_old_snapshots(self, days: int = 90) -> int:
         """
@@ -933,3 +1126,79 @@ def list_account_database_hashes(data_dir: str) -> List[str]:
             api_key_hashes.append(match.group('api_key_hash'))
 
     return sorted(api_key_hashes)
+
+
+_database_cache: "OrderedDict[str, Database]" = OrderedDict()
+_database_cache_lock = threading.Lock()
+
+
+def get_cached_database(api_key_hash: str) -> Database:
+    """
+    Get a long-lived Database handle for an account.
+    
+    Constructing a Database runs the full schema/migration check, so request
+    handlers share one handle per account instead of building a new one on
+    every request. Connections are still opened per operation, which keeps
+    the handle safe to use from concurrent request threads.
+    
+    Args:
+        api_key_hash: Hash of the API key
+        
+    Returns:
+        Cached (or freshly created) Database instance
+    """
+    db_path = get_database_path(api_key_hash)
+    
+    with _database_cache_lock:
+        db = _database_cache.get(api_key_hash)
+        # The file may have been removed (e.g. admin key deletion in another
+        # process); rebuild the handle so the schema gets recreated.
+        if db is not None and os.path.exists(db_path):
+            _database_cache.move_to_end(api_key_hash)
+            return db
+    
+    db = Database(db_path)
+    
+    with _database_cache_lock:
+        _database_cache[api_key_hash] = db
+        _database_cache.move_to_end(api_key_hash)
+        while len(_database_cache) > DATABASE_CACHE_SIZE:
+            _database_cache.popitem(last=False)
+    
+    return db
+
+
+def evict_cached_database(api_key_hash: str):
+    """Drop the cached Database handle for an account, if any"""
+    with _database_cache_lock:
+        _database_cache.pop(api_key_hash, None)
+
+
+_data_source_counts_cache = TTLCache(maxsize=256, ttl=DATA_SOURCE_COUNTS_TTL)
+
+
+def get_cached_data_source_counts(db: Database) -> Dict[str, int]:
+    """
+    Get record counts per data source, reusing a recent result.
+    
+    Dashboard, picker and status routes all show these counts, and each
+    uncached call runs a COUNT(*) on every synced table. Counts may lag by up
+    to DATA_SOURCE_COUNTS_TTL seconds; syncs and data clears in this process
+    evict the entry as soon as they finish.
+    
+    Args:
+        db: Database instance for the account
+        
+    Returns:
+        Dict of table name -> record count (treat as read-only)
+    """
+    counts = _data_source_counts_cache.get(db.db_path)
+    if counts is None:
+        counts = db.get_data_source_counts()
+        _data_source_counts_cache.set(db.db_path, counts)
+    return counts
+
+
+def evict_cached_data_source_counts(db_path: str):
+    """Drop the cached data source counts for a database file, if any"""
+    _data_source_counts_cache.pop(db_path)
@@ -97,6 +97,7 @@ def _build_attachments_dict(
 def _generate_pass(
     *,
     generator,
+    api_key_hash: str,
     template_html: str,
     start_date,
     end_date,
@@ -129,12 +130,15 @@ def _generate_pass(
     html_attachment_content: Optional[bytes] = None
     html_attachment_filename: Optional[str] = None
 
+    # Encode once; the PDF renderer and the HTML attachment share the bytes
+    html_bytes = html_content.encode('utf-8')
+
     if attachment_format in ('pdf', 'both'):
-        pdf_content = PDFService.html_to_pdf(html_content)
+        pdf_content = PDFService.html_to_pdf(html_bytes, api_key_hash)
         pdf_filename = f"{base_filename}-{date_str}.pdf"
 
     if attachment_format in ('html', 'both'):
-        html_attachment_content = html_content.encode('utf-8')
+        html_attachment_content = html_bytes
         html_attachment_filename = f"{base_filename}-{date_str}.html"
 
     return {
@@ -149,6 +153,7 @@ def _generate_pass(
 def build_email_attachments(
     *,
     generator,
+    api_key_hash: str,
     template_html: str,
     start_date,
     end_date,
@@ -171,6 +176,7 @@ def build_email_attachments(
 
     Args:
         generator: ``ReportGenerator`` instance.
+        api_key_hash: Account the report belongs to (scopes the PDF cache).
         template_html: The Jinja2 template HTML to render.
         start_date / end_date: Reporting period (UTC).
         data_sources: List of data sources passed to the generator.
@@ -198,6 +204,7 @@ def build_email_attachments(
     # First pass: gentle compression, preserves most visual quality.
     result = _generate_pass(
         generator=generator,
+        api_key_hash=api_key_hash,
         template_html=template_html,
         start_date=start_date,
         end_date=end_date,
@@ -247,6 +254,7 @@ def build_email_attachments(
 
     result = _generate_pass(
         generator=generator,
+        api_key_hash=api_key_hash,
         template_html=template_html,
         start_date=start_date,
         end_date=end_date,
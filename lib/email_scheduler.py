@@ -6,16 +6,16 @@ import logging
 from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from .database import Database, get_database_path, list_account_database_hashes
-from .email_schedules import EmailScheduleManager
-from .templates import TemplateManager
+from .database import Database, get_cached_database, get_database_path, list_account_database_hashes
+from .email_schedules import EmailScheduleManager, DATE_RANGE_DAYS, report_window, DEFAULT_EMAIL_SUBJECT, DEFAULT_EMAIL_BODY
+from .templates import get_cached_template_manager
 from .report_generator import ReportGenerator
+from .sandbox_config import get_compiled_template, template_uses_variable
 from .email_service import EmailService
 from .pdf_service import PDFService
 from .email_builder import build_email_attachments, EmailTooLargeError
 from .slide_api import InvalidAPIKeyError
 import pytz
-from datetime import timedelta
 
 logger = logging.getLogger(__name__)
 
@@ -80,7 +80,7 @@ class EmailScheduler:
             if not os.path.exists(db_path):
                 return
             
-            db = Database(db_path)
+            db = get_cached_database(api_key_hash)
             esm = EmailScheduleManager(db_path)
             
             # Get timezone for this user
@@ -280,7 +280,7 @@ class EmailScheduler:
     def _execute_schedule(self, api_key_hash: str, schedule: dict, timezone: str):
         """Execute a single email schedule"""
         db_path = get_database_path(api_key_hash)
-        db = Database(db_path)
+        db = get_cached_database(api_key_hash)
         esm = EmailScheduleManager(db_path)
         
         try:
@@ -305,22 +305,12 @@ class EmailScheduler:
         try:
             # Calculate date range
             user_tz = pytz.timezone(timezone)
-            now = datetime.now(user_tz)
-            yesterday = now - timedelta(days=1)
-            end_date = yesterday.replace(hour=23, minute=59, second=59, microsecond=999999)
-            
-            date_range_type = schedule['date_range_type']
-            if date_range_type == 'last_day':
-                start_date = yesterday.replace(hour=0, minute=0, second=0, microsecond=0)
-            elif date_range_type == '7_days':
-                start_date = (yesterday - timedelta(days=6)).replace(hour=0, minute=0, second=0, microsecond=0)
-            elif date_range_type == '30_days':
-                start_date = (yesterday - timedelta(days=29)).replace(hour=0, minute=0, second=0, microsecond=0)
-            else:  # 90_days
-                start_date = (yesterday - timedelta(days=89)).replace(hour=0, minute=0, second=0, microsecond=0)
+            # Unknown types fall back to the widest window
+            range_days = DATE_RANGE_DAYS.get(schedule['date_range_type'], DATE_RANGE_DAYS['90_days'])
+            start_date, end_date = report_window(range_days, user_tz)
             
             # Get template
-            tm = TemplateManager(api_key_hash)
+            tm = get_cached_template_manager(api_key_hash)
             template = tm.get_template(schedule['template_id'])
             
             if not template:
@@ -341,35 +331,28 @@ class EmailScheduler:
                 '/static/img/logo.png', schedule.get('client_id')
             )
             
-            # Add exec_summary to context if AI generator is available
-            if self.ai_generator:
-                try:
-                    email_context['exec_summary'] = self.ai_generator.generate_executive_summary(email_context)
-                except Exception as e:
-                    logger.warning(f"AI summary generation failed: {e}")
-                    email_context['exec_summary'] = generator._generate_summary(email_context)
-            else:
-                email_context['exec_summary'] = email_context.get('executive_summary', generator._generate_summary(email_context))
-            
-            # Render email subject and body with template variables
-            from .sandbox_config import get_sandbox
+            subject_source = schedule.get('email_subject', DEFAULT_EMAIL_SUBJECT)
+            body_source = schedule.get('email_body', DEFAULT_EMAIL_BODY)
             
-            # Use sandboxed environment to prevent SSTI attacks
-            sandbox = get_sandbox()
+            # Add exec_summary to context (via AI if available), but only when
+            # the subject or body shows it; the report HTML generates its own
+            if (template_uses_variable(subject_source, 'exec_summary')
+                    or template_uses_variable(body_source, 'exec_summary')):
+                if self.ai_generator:
+                    try:
+                        email_context['exec_summary'] = self.ai_generator.generate_executive_summary(email_context)
+                    except Exception as e:
+                        logger.warning(f"AI summary generation failed: {e}")
+                        email_context['exec_summary'] = generator._generate_summary(email_context)
+                else:
+                    email_context['exec_summary'] = email_context.get('executive_summary', generator._generate_summary(email_context))
             
-            subject_template = sandbox.from_string(schedule.get('email_subject', 'Slide Backup Report - {{ date_range }}'))
+            # Render email subject and body with template variables
+            # Compiled in the sandboxed environment to prevent SSTI attacks
+            subject_template = get_compiled_template(subject_source)
             email_subject = subject_template.render(**email_context)
             
-            body_template = sandbox.from_string(schedule.get('email_body', '''Your Slide Backup Report for {{ date_range }} is ready.
-
-Executive Summary:
-{{ exec_summary }}
-
-Key Metrics:
-- Total Backups: {{ total_backups }}
-- Success Rate: {{ success_rate }}%
-
-Report generated at {{ generated_at }} ({{ timezone }})'''))
+            body_template = get_compiled_template(body_source)
             email_body = body_template.render(**email_context)
             
             # Build attachments with image optimization and size-aware retry.
@@ -378,6 +361,7 @@ Report generated at {{ generated_at }} ({{ timezone }})'''))
 
             attachments = build_email_attachments(
                 generator=generator,
+                api_key_hash=api_key_hash,
                 template_html=template['html_content'],
                 start_date=start_date,
                 end_date=end_date,
@@ -2,12 +2,62 @@
 Email schedule management for automated report sending.
 """
 import sqlite3
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from datetime import datetime, time, timedelta
+from typing import Optional, Dict, Any, List, Tuple
 from contextlib import contextmanager
+from .database import configure_connection
 import pytz
 
 
+# Days a schedule's date_range_type reaches back before "yesterday"; the
+# report window runs from that day's midnight to the end of yesterday
+DATE_RANGE_DAYS = {
+    'last_day': 0,
+    '7_days': 6,
+    '30_days': 29,
+    '90_days': 89,
+}
+
+
+def report_window(range_days: int, user_tz: pytz.BaseTzInfo,
+                  now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """
+    Get the reporting period for a send: whole days ending with yesterday.
+    
+    Each bound is localized on its own date, so a window spanning a DST
+    change still starts at local midnight.
+    
+    Args:
+        range_days: Days before yesterday to include (see DATE_RANGE_DAYS)
+        user_tz: User's timezone
+        now: Reference time (defaults to the current time)
+        
+    Returns:
+        Tuple of (start of first day, end of yesterday) in user_tz
+    """
+    if now is None:
+        now = datetime.now(user_tz)
+    yesterday = now.astimezone(user_tz).date() - timedelta(days=1)
+    start_date = user_tz.localize(datetime.combine(yesterday - timedelta(days=range_days), time.min))
+    end_date = user_tz.localize(datetime.combine(yesterday, time.max))
+    return start_date, end_date
+
+
+# Subject/body used when a schedule doesn't define its own
+DEFAULT_EMAIL_SUBJECT = "Slide Backup Report - {{ date_range }}"
+
+DEFAULT_EMAIL_BODY = """Your Slide Backup Report for {{ date_range }} is ready.
+
+Executive Summary:
+{{ exec_summary }}
+
+Key Metrics:
+- Total Backups: {{ total_backups }}
+- Success Rate: {{ success_rate }}%
+
+Report generated at {{ generated_at }} ({{ timezone }})"""
+
+
 class EmailScheduleManager:
     """Manage email schedules for a specific user"""
     
@@ -25,6 +75,8 @@ class EmailScheduleManager:
         """Context manager for database connections"""
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
+        # Same file as Database; use the same connection settings
+        configure_connection(conn)
         try:
             yield conn
             conn.commit()
@@ -67,19 +119,10 @@ class EmailScheduleManager:
         """
         # Set defaults if not provided
         if email_subject is None:
-            email_subject = "Slide Backup Report - {{ date_range }}"
+            email_subject = DEFAULT_EMAIL_SUBJECT
         
         if email_body is None:
-            email_body = """Your Slide Backup Report for {{ date_range }} is ready.
-
-Executive Summary:
-{{ exec_summary }}
-
-Key Metrics:
-- Total Backups: {{ total_backups }}
-- Success Rate: {{ success_rate }}%
-
-Report generated at {{ generated_at }} ({{ timezone }})"""
+            email_body = DEFAULT_EMAIL_BODY
         
         # Calculate next_run_at if scheduling is enabled
         next_run_at = None
@@ -133,6 +176,33 @@ Report generated at {{ generated_at }} ({{ timezone }})"""
             cursor.execute("SELECT * FROM email_schedules ORDER BY created_at DESC")
             return [dict(row) for row in cursor.fetchall()]
     
+    def list_upcoming(self, limit: int = 5, now_utc: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List the next enabled schedules that are due to run.
+        
+        Args:
+            limit: Maximum number of schedules to return
+            now_utc: ISO timestamp to compare against (defaults to current UTC time)
+            
+        Returns:
+            List of schedule dicts ordered by next_run_at
+        """
+        if now_utc is None:
+            # Same shape calculate_next_run stores ('...T09:00:00+00:00'), so
+            # the string comparison in SQL is exact
+            now_utc = datetime.now(pytz.UTC).isoformat(timespec='seconds')
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM email_schedules
+                WHERE enabled = 1
+                AND next_run_at > ?
+                ORDER BY next_run_at
+                LIMIT ?
+            """, (now_utc, limit))
+            return [dict(row) for row in cursor.fetchall()]
+    
     def update_schedule(self, schedule_id: int, name: Optional[str] = None,
                        email_address: Optional[str] = None, template_id: Optional[int] = None,
                        date_range_type: Optional[str] = None, client_id: Optional[str] = None,
@@ -4,11 +4,29 @@ Email service for sending reports via Postmark API.
 import requests
 import base64
 import logging
+from http.cookiejar import DefaultCookiePolicy
 from typing import Optional, List, Dict, Any
 
 logger = logging.getLogger(__name__)
 
 
+def _build_postmark_session() -> requests.Session:
+    """
+    Build the keep-alive session used for Postmark sends.
+    
+    Scheduled runs send several reports back to back, so reusing the TLS
+    connection saves a handshake per email. The server token travels in
+    per-request headers and cookies are refused, so nothing is shared
+    between EmailService instances beyond the socket.
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+_postmark_session = _build_postmark_session()
+
+
 class EmailService:
     """Service for sending emails via Postmark"""
     
@@ -96,7 +114,7 @@ class EmailService:
             payload["Attachments"] = attachments
         
         try:
-            response = requests.post(self.postmark_url, json=payload, headers=headers)
+            response = _postmark_session.post(self.postmark_url, json=payload, headers=headers)
             
             if response.status_code == 200:
                 logger.info(f"Email sent successfully to {to_email}")
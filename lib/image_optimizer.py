@@ -28,7 +28,7 @@ def is_logo_src(src_url: str) -> bool:
     """
     if not src_url:
         return False
-    # The custom_logo_base64 preference is inlined as a data: URL already.
+    # Custom logos are inlined into reports as a data: URL already.
     if src_url.startswith('data:'):
         return True
     # Local static assets (logo lives at /static/img/logo.png)
@@ -2,28 +2,91 @@
 PDF generation service for converting HTML reports to PDF.
 """
 from weasyprint import HTML
+import hashlib
 import io
 import logging
+import os
+import threading
+import time
+from typing import Union
 
 logger = logging.getLogger(__name__)
 
 
+# Rendered PDFs are cached on disk by a hash of their HTML, so re-sending an
+# identical report (e.g. repeated test sends) skips WeasyPrint entirely. Each
+# account gets its own directory (removed with the account's other data), and
+# the cache is small and short-lived since the files contain account data.
+PDF_CACHE_MAX_FILES = 32
+PDF_CACHE_TTL_SECONDS = 3600
+
+# WeasyPrint is CPU and memory hungry; cap concurrent renders process-wide.
+# Renders run on the calling thread once a slot is free, and give up if none
+# frees up within PDF_RENDER_WAIT_SECONDS.
+PDF_RENDER_SLOTS = 2
+PDF_RENDER_WAIT_SECONDS = 120
+
+_render_slots = threading.BoundedSemaphore(PDF_RENDER_SLOTS)
+
+
+def _pdf_cache_dir(api_key_hash: str) -> str:
+    """Directory holding an account's cached PDFs (inside DATA_DIR)"""
+    base_dir = os.environ.get('DATA_DIR', '/var/www/reports.slide.recipes/data')
+    return os.path.join(base_dir, 'pdf_cache', api_key_hash)
+
+
+def _read_cached_pdf(api_key_hash: str, cache_key: str):
+    """Return cached PDF bytes for cache_key, or None if missing/expired"""
+    path = os.path.join(_pdf_cache_dir(api_key_hash), f"{cache_key}.pdf")
+    try:
+        if time.time() - os.path.getmtime(path) > PDF_CACHE_TTL_SECONDS:
+            os.remove(path)
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning(f"Failed to read cached PDF {cache_key}: {e}")
+        return None
+
+
+def _write_cached_pdf(api_key_hash: str, cache_key: str, pdf_bytes: bytes):
+    """Store PDF bytes under cache_key and trim the account's cache to its size cap"""
+    cache_dir = _pdf_cache_dir(api_key_hash)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(cache_dir, f"{cache_key}.pdf")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(pdf_bytes)
+        os.replace(tmp_path, path)
+        
+        entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith('.pdf')]
+        if len(entries) > PDF_CACHE_MAX_FILES:
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in entries[:len(entries) - PDF_CACHE_MAX_FILES]:
+                os.remove(entry.path)
+    except OSError as e:
+        logger.warning(f"Failed to cache PDF {cache_key}: {e}")
+
+
 class PDFService:
     """Service for converting HTML to PDF"""
     
     @staticmethod
-    def _inject_width_css(html_content: str) -> str:
+    def _inject_width_css(html_content: bytes) -> bytes:
         """
         Inject CSS to set explicit rendering width for PDF.
         WeasyPrint doesn't use viewport meta tags, so we need explicit CSS widths.
         
         Args:
-            html_content: Original HTML content
+            html_content: Original HTML content (UTF-8 encoded)
             
         Returns:
             HTML with injected width CSS
         """
-        width_css = """
+        width_css = b"""
         <style>
             @page {
                 size: 1600px 2400px;
@@ -39,11 +102,11 @@ class PDFService:
         """
         
         # Try to inject before closing </head> tag
-        if '</head>' in html_content:
-            html_content = html_content.replace('</head>', f'{width_css}</head>')
-        elif '<body>' in html_content:
+        if b'</head>' in html_content:
+            html_content = html_content.replace(b'</head>', width_css + b'</head>')
+        elif b'<body>' in html_content:
             # If no </head>, inject before <body>
-            html_content = html_content.replace('<body>', f'{width_css}<body>')
+            html_content = html_content.replace(b'<body>', width_css + b'<body>')
         else:
             # Otherwise just prepend it
             html_content = width_css + html_content
@@ -51,12 +114,34 @@ class PDFService:
         return html_content
     
     @staticmethod
-    def html_to_pdf(html_content: str) -> bytes:
+    def _render_pdf(html_content: bytes) -> bytes:
+        """Render HTML to PDF bytes with WeasyPrint"""
+        # Inject CSS to set explicit rendering width for WeasyPrint
+        html_content = PDFService._inject_width_css(html_content)
+        
+        # Create a BytesIO buffer to store the PDF
+        pdf_buffer = io.BytesIO()
+        
+        # Convert HTML to PDF with explicit width CSS and DPI
+        # WeasyPrint can handle base64 encoded images in the HTML
+        # Zoom set to 0.5 to render at 50% scale
+        HTML(string=html_content, encoding='utf-8').write_pdf(pdf_buffer, zoom=0.5)
+        
+        # Get the PDF bytes
+        pdf_bytes = pdf_buffer.getvalue()
+        pdf_buffer.close()
+        return pdf_bytes
+    
+    @staticmethod
+    def html_to_pdf(html_content: Union[str, bytes], api_key_hash: str) -> bytes:
         """
         Convert HTML report to PDF bytes.
         
         Args:
-            html_content: Complete HTML document as string
+            html_content: Complete HTML document, as a string or UTF-8 bytes.
+                Callers that also attach the HTML can pass their encoded copy
+                to avoid a second encode of a large report.
+            api_key_hash: Account the report belongs to (scopes the PDF cache)
             
         Returns:
             PDF as bytes for email attachment
@@ -65,20 +150,22 @@ class PDFService:
             Exception: If PDF generation fails
         """
         try:
-            # Inject CSS to set explicit rendering width for WeasyPrint
-            html_content = PDFService._inject_width_css(html_content)
-            
-            # Create a BytesIO buffer to store the PDF
-            pdf_buffer = io.BytesIO()
+            if isinstance(html_content, str):
+                html_content = html_content.encode('utf-8')
             
-            # Convert HTML to PDF with explicit width CSS and DPI
-            # WeasyPrint can handle base64 encoded images in the HTML
-            # Zoom set to 0.5 to render at 50% scale
-            HTML(string=html_content).write_pdf(pdf_buffer, zoom=0.5)
+            cache_key = hashlib.blake2b(html_content, digest_size=16).hexdigest()
+            pdf_bytes = _read_cached_pdf(api_key_hash, cache_key)
+            if pdf_bytes is not None:
+                logger.info(f"PDF served from cache ({len(pdf_bytes)} bytes)")
+                return pdf_bytes
             
-            # Get the PDF bytes
-            pdf_bytes = pdf_buffer.getvalue()
-            pdf_buffer.close()
+            if not _render_slots.acquire(timeout=PDF_RENDER_WAIT_SECONDS):
+                raise TimeoutError('PDF renderer busy, try again later')
+            try:
+                pdf_bytes = PDFService._render_pdf(html_content)
+            finally:
+                _render_slots.release()
+            _write_cached_pdf(api_key_hash, cache_key, pdf_bytes)
             
             logger.info(f"PDF generated successfully ({len(pdf_bytes)} bytes)")
             return pdf_bytes
@@ -1,13 +1,73 @@
 """
 Report generation engine for creating reports from templates and data.
 """
+import base64
+import functools
+import os
 import pytz
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
 from typing import Dict, Any, Optional, List
+from .cache import TTLCache
 from .sandbox_config import get_sandbox
 from .database import Database
 
 
+_WORKSPACE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_STATIC_PATH = os.path.realpath(os.path.join(_WORKSPACE_PATH, 'static'))
+
+# Built report contexts, keyed by account, reporting window, filters and the
+# latest sync time. An email send builds the same context for its subject/body
+# and again for each attachment pass, and schedules sharing a window repeat it.
+# Kept small because a context holds the raw records for the whole window.
+_context_cache = TTLCache(maxsize=16, ttl=300)
+
+
+@functools.lru_cache(maxsize=32)
+def _static_image_data_url(src_url: str) -> str:
+    """
+    Read a bundled static image (e.g. the default logo) and return it as a
+    base64 data URL. Static assets only change on deploy, so the encoded
+    result is kept for the life of the process instead of re-reading and
+    re-encoding the file for every standalone report.
+
+    Raises:
+        FileNotFoundError: If the asset does not exist or resolves outside the
+            static directory (not cached).
+    """
+    file_path = os.path.realpath(os.path.join(_WORKSPACE_PATH, src_url.lstrip('/')))
+    if os.path.commonpath([file_path, _STATIC_PATH]) != _STATIC_PATH:
+        raise FileNotFoundError(src_url)
+    with open(file_path, 'rb') as f:
+        image_data = f.read()
+    mime_type = ReportGenerator._get_mime_type_from_url(src_url)
+    base64_data = base64.b64encode(image_data).decode('utf-8')
+    return f'data:{mime_type};base64,{base64_data}'
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Return a read-only view of a computed context value: lists become tuples
+    and dicts become mapping proxies, recursively. Cached contexts are shared
+    between renders, so templates must not be able to modify them.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_report_template(template_html: str):
+    """
+    Compile report HTML in the sandbox, reusing the result for identical
+    source. Keyed on the text itself, so editing a template naturally
+    misses the cache; kept small because report templates are large.
+    """
+    return get_sandbox().from_string(template_html)
+
+
 def format_datetime_friendly(dt: Optional[datetime], tz: pytz.timezone) -> str:
     """
     Format datetime in a human-friendly way.
@@ -24,8 +84,7 @@ def format_datetime_friendly(dt: Optional[datetime], tz: pytz.timezone) -> str:
     
     # Convert to user timezone
     if dt.tzinfo is None:
-        from datetime import timezone as tz_utc
-        dt = dt.replace(tzinfo=tz_utc.utc)
+        dt = dt.replace(tzinfo=timezone.utc)
     
     local_dt = dt.astimezone(tz)
     now = datetime.now(tz)
@@ -96,7 +155,7 @@ class ReportGenerator:
         user_tz = pytz.timezone(timezone_str)
         
         # Check for custom logo
-        custom_logo = self.database.get_preference('custom_logo_base64')
+        custom_logo = self.database.get_custom_logo_data_uri()
         if custom_logo:
             logo_url = custom_logo
         
@@ -125,8 +184,7 @@ class ReportGenerator:
         # Render template with graceful error handling
         try:
             # Use sandboxed environment to prevent SSTI attacks
-            sandbox = get_sandbox()
-            template = sandbox.from_string(template_html)
+            template = _compile_report_template(template_html)
             return template.render(**context)
         except Exception as e:
             import logging
@@ -402,8 +460,6 @@ class ReportGenerator:
             Rendered HTML report with base64-embedded images
         """
         import re
-        import base64
-        import os
         import logging as _logging
 
         from .image_optimizer import is_logo_src, optimize_image_bytes
@@ -442,6 +498,18 @@ class ReportGenerator:
             after_src = match.group(3)
 
             try:
+                # Bundled static assets are never optimized, so reuse the
+                # process-wide encoded copy. data: URLs (custom logos) fall
+                # through to the "skip" branch below untouched.
+                if src_url.startswith('/static/'):
+                    try:
+                        data_url = _static_image_data_url(src_url)
+                    except FileNotFoundError:
+                        _logging.warning(f"Image file not found: {src_url}")
+                        return match.group(0)
+                    stats['total_images'] += 1
+                    return f'<img{before_src}src="{data_url}"{after_src}>'
+
                 if src_url in image_cache:
                     image_data, mime_type = image_cache[src_url]
                 else:
@@ -467,8 +535,7 @@ class ReportGenerator:
                     elif src_url.startswith('/'):
                         # Local absolute path - convert to filesystem path
                         # Remove leading slash and resolve relative to workspace
-                        workspace_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                        file_path = os.path.join(workspace_path, src_url.lstrip('/'))
+                        file_path = os.path.join(_WORKSPACE_PATH, src_url.lstrip('/'))
 
                         if not os.path.exists(file_path):
                             _logging.warning(f"Image file not found: {file_path}")
@@ -554,12 +621,43 @@ class ReportGenerator:
     def _build_context(self, start_date: datetime, end_date: datetime,
                       user_tz: pytz.timezone, data_sources: Optional[List[str]],
                       logo_url: str, client_id: Optional[str] = None) -> Dict[str, Any]:
-        """Build template context with all calculated metrics"""
+        """
+        Build template context with all calculated metrics.
+        
+        The data-derived part is cached briefly (see _context_cache) with its
+        values frozen by _freeze. Each call gets a fresh top-level dict with
+        the logo and generation time filled in, so callers can still add keys
+        such as exec_summary without touching the cache.
+        """
+        last_sync = self.database.get_latest_sync_at()
+        cache_key = (
+            self.database.db_path,
+            start_date.isoformat(),
+            end_date.isoformat(),
+            str(user_tz),
+            tuple(data_sources or ()),
+            client_id,
+            last_sync,
+        )
+        
+        base_context = _context_cache.get(cache_key)
+        if base_context is None:
+            computed = self._compute_context(start_date, end_date, user_tz, data_sources, client_id)
+            base_context = {key: _freeze(value) for key, value in computed.items()}
+            _context_cache.set(cache_key, base_context)
+        
+        context = dict(base_context)
+        context['logo_url'] = logo_url
+        context['generated_at'] = self._format_datetime(datetime.utcnow(), user_tz)
+        return context
+    
+    def _compute_context(self, start_date: datetime, end_date: datetime,
+                         user_tz: pytz.timezone, data_sources: Optional[List[str]],
+                         client_id: Optional[str] = None) -> Dict[str, Any]:
+        """Query the database and calculate all metrics for _build_context"""
         context = {
-            'logo_url': logo_url,
             'report_title': 'Slide Backup Report',
             'date_range': f"{self._format_date(start_date, user_tz)} - {self._format_date(end_date, user_tz)}",
-            'generated_at': self._format_datetime(datetime.utcnow(), user_tz),
             'timezone': str(user_tz),
             'client_id': client_id,
         }
@@ -1131,7 +1229,6 @@ class ReportGenerator:
     def _calculate_agent_calendars(self, start_date: datetime, end_date: datetime,
                                    user_tz: pytz.timezone, client_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Generate calendar grid data per agent showing daily backup/retention status"""
-        from datetime import timezone as tz_utc
         
         # Get all agents
         if client_id:
@@ -1162,9 +1259,9 @@ class ReportGenerator:
             calendar_grid = []
             # Ensure dates are timezone-aware for comparison
             if start_date.tzinfo is None:
-                start_date = start_date.replace(tzinfo=tz_utc.utc)
+                start_date = start_date.replace(tzinfo=timezone.utc)
             if end_date.tzinfo is None:
-                end_date = end_date.replace(tzinfo=tz_utc.utc)
+                end_date = end_date.replace(tzinfo=timezone.utc)
             
             current_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
             end_date_normalized = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
@@ -1178,7 +1275,7 @@ class ReportGenerator:
                     backup_dt = self._parse_datetime(backup['started_at'])
                     if backup_dt:
                         if backup_dt.tzinfo is None:
-                            backup_dt = backup_dt.replace(tzinfo=tz_utc.utc)
+                            backup_dt = backup_dt.replace(tzinfo=timezone.utc)
                         if current_date <= backup_dt < next_date:
                             day_backups.append(backup)
                 
@@ -1799,10 +1896,9 @@ class ReportGenerator:
                             # Check if backup is old (>7 days)
                             now = datetime.utcnow()
                             if now.tzinfo is None:
-                                from datetime import timezone as tz_utc
-                                now = now.replace(tzinfo=tz_utc.utc)
+                                now = now.replace(tzinfo=timezone.utc)
                             if backup_dt.tzinfo is None:
-                                backup_dt = backup_dt.replace(tzinfo=tz_utc.utc)
+                                backup_dt = backup_dt.replace(tzinfo=timezone.utc)
                             
                             days_since_backup = (now - backup_dt).days
                             if days_since_backup > 7:
@@ -1925,8 +2021,7 @@ class ReportGenerator:
         
         # Convert to user timezone
         if dt.tzinfo is None:
-            from datetime import timezone as tz_utc
-            dt = dt.replace(tzinfo=tz_utc.utc)
+            dt = dt.replace(tzinfo=timezone.utc)
         
         local_dt = dt.astimezone(tz)
         
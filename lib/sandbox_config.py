@@ -2,8 +2,10 @@
 Centralized Jinja2 sandbox configuration for secure template rendering.
 Provides explicit whitelisting of safe filters and functions.
 """
+import functools
+
 from jinja2.sandbox import SandboxedEnvironment
-from jinja2 import select_autoescape
+from jinja2 import Template, TemplateSyntaxError, meta, select_autoescape
 
 
 def create_secure_sandbox():
@@ -48,6 +50,53 @@ def get_sandbox():
     return _global_sandbox
 
 
+@functools.lru_cache(maxsize=512)
+def get_compiled_template(template_content: str) -> Template:
+    """
+    Compile a template string in the global sandbox, reusing earlier results.
+    
+    Email subjects and bodies are rendered for every send but rarely change,
+    so caching by source text skips Jinja's parse/compile step on repeats.
+    
+    Args:
+        template_content: The template string to compile
+        
+    Returns:
+        Compiled template bound to the sandbox environment
+        
+    Raises:
+        TemplateSyntaxError: If template has syntax errors (not cached)
+    """
+    return get_sandbox().from_string(template_content)
+
+
+@functools.lru_cache(maxsize=512)
+def _template_variables(template_content: str) -> frozenset:
+    """Names a template reads from its context (cached by source text)"""
+    return frozenset(meta.find_undeclared_variables(get_sandbox().parse(template_content)))
+
+
+def template_uses_variable(template_content: str, name: str) -> bool:
+    """
+    Check whether a template reads a variable from its render context.
+    
+    Lets callers skip computing expensive values (e.g. the AI executive
+    summary) that the template never displays.
+    
+    Args:
+        template_content: The template source
+        name: Context variable name
+        
+    Returns:
+        True if the template references name. Templates with syntax errors
+        also return True so the error surfaces when they are rendered.
+    """
+    try:
+        return name in _template_variables(template_content)
+    except TemplateSyntaxError:
+        return True
+
+
 def render_template_safely(template_content: str, context: dict) -> str:
     """
     Safely render a Jinja2 template with the configured sandbox.
@@ -7,7 +7,7 @@ from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from .background_sync import background_sync
-from .database import Database, get_database_path, list_account_database_hashes
+from .database import get_cached_database, get_database_path, list_account_database_hashes
 from .encryption import Encryption
 
 logger = logging.getLogger(__name__)
@@ -66,7 +66,7 @@ class AutoSyncScheduler:
             if not os.path.exists(db_path):
                 return
             
-            db = Database(db_path)
+            db = get_cached_database(api_key_hash)
             
             # Check if auto-sync is enabled (default: false - only sync on manual trigger or before scheduled emails)
             auto_sync_enabled = db.get_preference('auto_sync_enabled', 'false').lower() == 'true'
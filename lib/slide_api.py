@@ -4,10 +4,30 @@ Handles pagination, rate limiting, and all endpoint operations.
 """
 import requests
 import time
-from typing import List, Dict, Any, Optional, Callable
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from datetime import datetime, timedelta
 
 
+def _build_shared_session() -> requests.Session:
+    """
+    Build the connection pool shared by every SlideAPIClient.
+    
+    Clients only differ by their Authorization header, which is sent per
+    request, so one keep-alive pool lets setup validations, syncs and
+    scheduled sends reuse TLS connections to the API. Cookies are refused
+    so nothing set for one account can leak into another's requests.
+    """
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50))
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+_shared_session = _build_shared_session()
+
+
 class InvalidAPIKeyError(Exception):
     """Raised when Slide's baseline endpoint rejects the key with 401/403.
 
@@ -27,6 +47,7 @@ class SlideAPIClient:
     BASE_URL = "https://api.slide.tech/v1"
     ITEMS_PER_PAGE = 50
     RATE_LIMIT_DELAY = 0.1  # 100ms between requests to stay under 10/sec
+    TEST_CONNECTION_TIMEOUT = (3, 10)  # (connect, read) seconds
     
     def __init__(self, api_key: str):
         """
@@ -36,11 +57,11 @@ class SlideAPIClient:
             api_key: Slide API token (starts with tk_)
         """
         self.api_key = api_key
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = _shared_session
+        self.headers = {
             'Authorization': f'Bearer {api_key}',
             'Content-Type': 'application/json'
-        })
+        }
         self.last_request_time = 0
     
     def _rate_limit(self):
@@ -65,7 +86,8 @@ class SlideAPIClient:
         url = f"{self.BASE_URL}/device"
 
         try:
-            response = self.session.request('GET', url, params={'limit': 1})
+            response = self.session.request('GET', url, params={'limit': 1},
+                                            headers=self.headers)
         except requests.RequestException:
             return None
 
@@ -78,7 +100,8 @@ class SlideAPIClient:
         return None
     
     def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None,
-                     json_data: Optional[Dict] = None) -> Dict[str, Any]:
+                     json_data: Optional[Dict] = None,
+                     timeout: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
         """
         Make an API request with rate limiting.
         
@@ -87,6 +110,7 @@ class SlideAPIClient:
             endpoint: API endpoint path
             params: Query parameters
             json_data: JSON body for POST/PATCH
+            timeout: Optional (connect, read) timeout in seconds
             
         Returns:
             Response data as dictionary
@@ -98,12 +122,13 @@ class SlideAPIClient:
         self._rate_limit()
         
         url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
-        response = self.session.request(method, url, params=params, json=json_data)
+        response = self.session.request(method, url, params=params, json=json_data,
+                                        headers=self.headers, timeout=timeout)
         
         if response.status_code == 429:
             # Rate limited - wait and retry
             time.sleep(1)
-            return self._make_request(method, endpoint, params, json_data)
+            return self._make_request(method, endpoint, params, json_data, timeout)
         
         if response.status_code in (401, 403):
             endpoint_path = endpoint.lstrip('/').split('?', 1)[0]
@@ -336,7 +361,8 @@ class SlideAPIClient:
             True if connection successful, False otherwise
         """
         try:
-            self._make_request('GET', 'device', params={'limit': 1})
+            self._make_request('GET', 'device', params={'limit': 1},
+                               timeout=self.TEST_CONNECTION_TIMEOUT)
             return True
         except (requests.HTTPError, InvalidAPIKeyError):
             return False
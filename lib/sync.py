@@ -6,7 +6,7 @@ import logging
 from typing import Dict, List, Optional, Callable, Any
 from datetime import datetime, timedelta
 from .slide_api import SlideAPIClient, InvalidAPIKeyError
-from .database import Database
+from .database import Database, get_cached_data_source_counts
 
 logger = logging.getLogger(__name__)
 
@@ -51,18 +51,36 @@ class SyncEngine:
         """
         Detect and recover from stale/interrupted sync operations.
         
+        Returns:
+            List of resource types that were recovered
+        """
+        return self.recover_stale_syncs_in_db(self.database)
+    
+    @classmethod
+    def recover_stale_syncs_in_db(cls, database: Database,
+                                  status_list: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+        """
+        Detect and recover from stale/interrupted sync operations in a database.
+        
         A sync is considered stale if it has been in 'syncing' status for longer
-        than STALE_SYNC_THRESHOLD_MINUTES.
+        than STALE_SYNC_THRESHOLD_MINUTES. Only touches the database, so no API
+        client is needed.
+        
+        Args:
+            database: Database instance
+            status_list: Rows from database.get_sync_status(), if the caller
+                already has them
         
         Returns:
             List of resource types that were recovered
         """
         recovered = []
-        threshold = datetime.utcnow() - timedelta(minutes=self.STALE_SYNC_THRESHOLD_MINUTES)
+        threshold = datetime.utcnow() - timedelta(minutes=cls.STALE_SYNC_THRESHOLD_MINUTES)
         
         try:
             # Get all sync statuses that are stuck in 'syncing'
-            status_list = self.database.get_sync_status()
+            if status_list is None:
+                status_list = database.get_sync_status()
             
             for status in status_list:
                 if status.get('status') == 'syncing':
@@ -83,7 +101,7 @@ class SyncEngine:
                                     f"Recovering stale sync for {resource_type}: "
                                     f"started at {last_sync_at}, threshold was {threshold.isoformat()}"
                                 )
-                                self.database.update_sync_status(
+                                database.update_sync_status(
                                     resource_type, 
                                     'interrupted', 
                                     status.get('items_synced', 0),
@@ -93,7 +111,7 @@ class SyncEngine:
                         except (ValueError, TypeError) as e:
                             # If we can't parse the timestamp, consider it stale
                             logger.warning(f"Could not parse sync time for {resource_type}: {e}")
-                            self.database.update_sync_status(
+                            database.update_sync_status(
                                 resource_type,
                                 'interrupted',
                                 0,
@@ -103,7 +121,7 @@ class SyncEngine:
                     else:
                         # No timestamp but status is syncing - definitely stale
                         logger.warning(f"Recovering sync with no timestamp for {resource_type}")
-                        self.database.update_sync_status(
+                        database.update_sync_status(
                             resource_type,
                             'interrupted',
                             0,
@@ -371,17 +389,35 @@ class SyncEngine:
     
     def get_sync_status(self) -> Dict[str, Any]:
         """Get current sync status for all sources"""
-        # Recover any stale syncs before returning status
-        self.recover_stale_syncs()
+        return self.get_sync_status_from_db(self.database)
+    
+    @classmethod
+    def get_sync_status_from_db(cls, database: Database) -> Dict[str, Any]:
+        """
+        Get current sync status for all sources straight from the database.
+        
+        Status pages poll this frequently, so it deliberately needs no API
+        client.
+        
+        Args:
+            database: Database instance
+        
+        Returns:
+            Dict of source key -> status details
+        """
+        status_list = database.get_sync_status()
         
-        status_list = self.database.get_sync_status()
-        counts = self.database.get_data_source_counts()
+        # Recover any stale syncs before returning status; only re-read the
+        # rows if recovery rewrote some of them
+        if cls.recover_stale_syncs_in_db(database, status_list):
+            status_list = database.get_sync_status()
+        counts = get_cached_data_source_counts(database)
         
         status_dict = {}
         for status in status_list:
             source = status['resource_type']
             status_dict[source] = {
-                'name': self.DATA_SOURCES.get(source, source),
+                'name': cls.DATA_SOURCES.get(source, source),
                 'last_sync': status.get('last_sync_at'),
                 'status': status.get('status', 'never'),
                 'items_synced': status.get('items_synced', 0),
@@ -390,10 +426,10 @@ class SyncEngine:
             }
         
         # Add sources that haven't been synced yet
-        for source in self.DATA_SOURCES:
+        for source in cls.DATA_SOURCES:
             if source not in status_dict:
                 status_dict[source] = {
-                    'name': self.DATA_SOURCES[source],
+                    'name': cls.DATA_SOURCES[source],
                     'last_sync': None,
                     'status': 'never',
                     'items_synced': 0,
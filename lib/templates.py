@@ -4,12 +4,19 @@ Template management system for storing and managing report templates.
 import sqlite3
 import os
 import json
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from contextlib import contextmanager
 from .builtin_templates import get_builtin_templates, get_builtin_template_by_id
 
 
+# Maximum number of per-account TemplateManager handles kept alive by
+# get_cached_template_manager(). Least recently used handles are dropped first.
+TEMPLATE_MANAGER_CACHE_SIZE = 64
+
+
 class TemplateManager:
     """Manage report templates for a specific user"""
     
@@ -99,6 +106,39 @@ class TemplateManager:
                 return template
             return None
     
+    def get_template_names(self, template_ids) -> Dict[int, str]:
+        """
+        Look up names for several templates (built-in or user) at once.
+        
+        User templates are fetched with a single query instead of one
+        get_template() call each.
+        
+        Returns:
+            Mapping of template_id to name for the IDs that exist
+        """
+        names = {}
+        user_ids = []
+        for template_id in set(int(template_id) for template_id in template_ids):
+            if template_id < 0:
+                template = get_builtin_template_by_id(template_id)
+                if template:
+                    names[template_id] = template['name']
+            else:
+                user_ids.append(template_id)
+        
+        if user_ids:
+            placeholders = ', '.join(['?'] * len(user_ids))
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"SELECT template_id, name FROM templates WHERE template_id IN ({placeholders})",
+                    user_ids
+                )
+                for row in cursor.fetchall():
+                    names[row['template_id']] = row['name']
+        
+        return names
+    
     def get_default_template(self) -> Optional[Dict[str, Any]]:
         """Get the default template (always returns built-in Weekly Report)"""
         builtin_templates = get_builtin_templates()
@@ -176,3 +216,45 @@ class TemplateManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM templates WHERE template_id = ?", (template_id,))
+
+
+_template_manager_cache: "OrderedDict[str, TemplateManager]" = OrderedDict()
+_template_manager_cache_lock = threading.Lock()
+
+
+def get_cached_template_manager(api_key_hash: str) -> TemplateManager:
+    """
+    Get a long-lived TemplateManager for an account.
+    
+    Constructing a TemplateManager creates the data directory and runs the
+    schema check, so request handlers share one per account. Connections are
+    still opened per operation.
+    
+    Args:
+        api_key_hash: Hash of the API key
+        
+    Returns:
+        Cached (or freshly created) TemplateManager instance
+    """
+    with _template_manager_cache_lock:
+        tm = _template_manager_cache.get(api_key_hash)
+        # Rebuild if the file was removed (e.g. admin key deletion)
+        if tm is not None and os.path.exists(tm.db_path):
+            _template_manager_cache.move_to_end(api_key_hash)
+            return tm
+    
+    tm = TemplateManager(api_key_hash)
+    
+    with _template_manager_cache_lock:
+        _template_manager_cache[api_key_hash] = tm
+        _template_manager_cache.move_to_end(api_key_hash)
+        while len(_template_manager_cache) > TEMPLATE_MANAGER_CACHE_SIZE:
+            _template_manager_cache.popitem(last=False)
+    
+    return tm
+
+
+def evict_cached_template_manager(api_key_hash: str):
+    """Drop the cached TemplateManager for an account, if any"""
+    with _template_manager_cache_lock:
+        _template_manager_cache.pop(api_key_hash, None)
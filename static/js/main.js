@@ -245,6 +245,11 @@ const syncManager = {
      * Poll sync status
      */
     async pollSyncStatus() {
+        // Prefer the server-pushed stream; fall back to polling if it fails
+        if (window.EventSource && await this.streamSyncStatus()) {
+            return;
+        }
+        
         const progressContainer = document.getElementById('sync-progress-items');
         let pollCount = 0;
         const maxPolls = 300; // 5 minutes max (300 * 1000ms)
@@ -280,6 +285,48 @@ const syncManager = {
         }
     },
     
+    /**
+     * Follow sync status over Server-Sent Events.
+     * Resolves true once the sync has finished, or false if the stream
+     * dropped while the sync is still running.
+     */
+    streamSyncStatus() {
+        const progressContainer = document.getElementById('sync-progress-items');
+        let lastCountUpdate = 0;
+        
+        return new Promise(resolve => {
+            const source = new EventSource('/api/sync/stream');
+            
+            source.onmessage = event => {
+                const data = JSON.parse(event.data);
+                const finished = data.sync_state === 'completed' || data.sync_state === 'error';
+                
+                if (progressContainer) {
+                    this.updateProgressDisplay(data.sources, progressContainer, data.current_source);
+                }
+                
+                // Update counts every 5 seconds
+                const now = Date.now();
+                if (finished || now - lastCountUpdate >= 5000) {
+                    this.updateDataCounts(data.counts);
+                    lastCountUpdate = now;
+                }
+                
+                if (finished) {
+                    this.isSyncing = false;
+                    source.close();
+                    resolve(true);
+                }
+            };
+            
+            source.onerror = () => {
+                // Don't let EventSource reconnect on its own; the caller decides
+                source.close();
+                resolve(!this.isSyncing);
+            };
+        });
+    },
+    
     /**
      * Update progress display
      */
@@ -754,13 +801,14 @@ const reportManager = {
                 throw new Error('Preview generation failed');
             }
             
-            const data = await response.json();
+            // The preview endpoint returns the report HTML directly
+            const html = await response.text();
             
             // Display preview
             if (previewFrame) {
                 const previewDoc = previewFrame.contentDocument || previewFrame.contentWindow.document;
                 previewDoc.open();
-                previewDoc.write(data.html);
+                previewDoc.write(html);
                 previewDoc.close();
             }
             
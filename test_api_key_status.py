@@ -84,17 +84,17 @@ class SlideAPIKeyStatusTests(unittest.TestCase):
 
 class ScheduledReportRecoveryTests(unittest.TestCase):
     @patch('lib.email_scheduler.EmailScheduleManager')
-    @patch('lib.email_scheduler.Database')
+    @patch('lib.email_scheduler.get_cached_database')
     @patch('lib.email_scheduler.os.path.exists', return_value=True)
     @patch('lib.email_scheduler.get_database_path', return_value='/tmp/account.db')
     def test_due_schedule_runs_even_with_previously_disabled_key(
         self,
         _get_database_path,
         _path_exists,
-        database_class,
+        get_cached_database,
         schedule_manager_class,
     ):
-        database = database_class.return_value
+        database = get_cached_database.return_value
         database.get_preference.return_value = 'America/New_York'
 
         schedule = {'schedule_id': 7}
@@ -0,0 +1,48 @@
+"""Regression tests for custom logo storage."""
+import base64
+import tempfile
+import unittest
+from pathlib import Path
+
+from lib.database import Database
+
+
+PNG_BYTES = b'\x89PNG\r\n\x1a\n' + b'\x00' * 32
+
+
+class CustomLogoStorageTests(unittest.TestCase):
+    def test_logo_round_trips_as_raw_bytes(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            database = Database(str(Path(data_dir, '0123456789abcdef.db')))
+
+            etag = database.set_custom_logo(PNG_BYTES, 'image/png')
+
+            logo = database.get_custom_logo()
+            self.assertEqual(logo['data'], PNG_BYTES)
+            self.assertEqual(logo['mime_type'], 'image/png')
+            self.assertEqual(database.get_custom_logo_etag(), etag)
+            self.assertEqual(
+                database.get_custom_logo_data_uri(),
+                'data:image/png;base64,' + base64.b64encode(PNG_BYTES).decode('ascii'),
+            )
+
+            database.delete_custom_logo()
+            self.assertIsNone(database.get_custom_logo())
+            self.assertIsNone(database.get_custom_logo_data_uri())
+
+    def test_legacy_base64_preference_is_migrated(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            db_path = str(Path(data_dir, '0123456789abcdef.db'))
+            Database(db_path).set_preference(
+                'custom_logo_base64',
+                'data:image/png;base64,' + base64.b64encode(PNG_BYTES).decode('ascii'),
+            )
+
+            database = Database(db_path)
+
+            self.assertEqual(database.get_custom_logo()['data'], PNG_BYTES)
+            self.assertIsNone(database.get_preference('custom_logo_base64'))
+
+
+if __name__ == '__main__':
+    unittest.main()
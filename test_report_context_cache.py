@@ -0,0 +1,40 @@
+"""Regression tests for the cached report context."""
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytz
+
+from lib.database import Database
+from lib.report_generator import ReportGenerator
+
+
+class ReportContextCacheTests(unittest.TestCase):
+    def test_mutating_template_does_not_change_cached_context(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            database = Database(str(Path(data_dir, '0123456789abcdef.db')))
+            database.upsert_record('devices', 'device_id', {
+                'device_id': 'd1',
+                'display_name': 'Device 1',
+                'hostname': 'host-1',
+            })
+            generator = ReportGenerator(database)
+            end_date = datetime(2025, 1, 31)
+            start_date = end_date - timedelta(days=30)
+
+            for template_html in (
+                '{% set _ = devices.pop() %}{{ devices | length }}',
+                "{% set _ = devices[0].update({'device_id': 'd2'}) %}{{ devices | length }}",
+            ):
+                html = generator.generate_report(template_html, start_date, end_date)
+                self.assertNotEqual(html, '0')
+                self.assertNotIn('d2', html)
+
+            context = generator._build_context(start_date, end_date, pytz.timezone('America/New_York'),
+                                               None, '/static/img/logo.png')
+            self.assertEqual([device['device_id'] for device in context['devices']], ['d1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
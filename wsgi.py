@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import sys
 import os
+import fcntl
 from dotenv import load_dotenv
 
 # Add the project directory to the Python path
@@ -11,20 +12,53 @@ load_dotenv("/var/www/reports.slide.recipes/.env")
 
 from app import app, auto_sync_scheduler, email_scheduler, logger
 
-# Start auto-sync scheduler for WSGI/production
-try:
-    auto_sync_scheduler.start()
-    logger.info("Auto-sync scheduler initialized in WSGI mode")
-except Exception as e:
-    logger.error(f"Failed to start auto-sync scheduler in WSGI: {e}")
 
-# Start email scheduler if configured
-if email_scheduler:
+def _acquire_scheduler_lock():
+    """
+    Take the per-host scheduler lock without blocking.
+    
+    The WSGI server imports this file in every worker process; without the
+    lock each worker would run its own auto-sync checks and email sends.
+    The lock is held for the life of the process and released by the OS
+    when it exits, so a replacement worker can take over.
+    
+    Returns:
+        The open lock file (keep a reference), or None if another process
+        already holds it
+    """
+    data_dir = os.environ.get('DATA_DIR', '/var/www/reports.slide.recipes/data')
+    os.makedirs(data_dir, exist_ok=True)
+    lock_file = open(os.path.join(data_dir, 'scheduler.lock'), 'w')
     try:
-        email_scheduler.start()
-        logger.info("Email scheduler initialized in WSGI mode")
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+# Set ENABLE_SCHEDULER=0 on hosts that should only serve requests
+_scheduler_lock = None
+if os.environ.get('ENABLE_SCHEDULER', '1') == '1':
+    _scheduler_lock = _acquire_scheduler_lock()
+    if _scheduler_lock is None:
+        logger.info("Schedulers already running in another worker process")
+
+if _scheduler_lock is not None:
+    # Start auto-sync scheduler for WSGI/production
+    try:
+        auto_sync_scheduler.start()
+        logger.info("Auto-sync scheduler initialized in WSGI mode")
     except Exception as e:
-        logger.error(f"Failed to start email scheduler in WSGI: {e}")
+        logger.error(f"Failed to start auto-sync scheduler in WSGI: {e}")
+    
+    # Start email scheduler if configured
+    if email_scheduler:
+        try:
+            email_scheduler.start()
+            logger.info("Email scheduler initialized in WSGI mode")
+        except Exception as e:
+            logger.error(f"Failed to start email scheduler in WSGI: {e}")
 
 # WSGI expects an 'application' variable
 application = app